@@ -1,9 +1,58 @@
 """App Settings"""
 
 # Django
-# from django.conf import settings
+from django.conf import settings
 
-# # put your app settings here
+# Run each SDE section import in a short lived child process so the
+# celery worker hands the memory used by the import back to the OS.
+ESDE_SECTION_SUBPROCESS = getattr(settings, "ESDE_SECTION_SUBPROCESS", False)
+# Seconds before a section child process is killed and the import fails,
+# None waits forever.
+ESDE_SECTION_SUBPROCESS_TIMEOUT = getattr(settings, "ESDE_SECTION_SUBPROCESS_TIMEOUT", 60 * 60)
 
+# Bulk write batching, batch sizes are tuned per model and operation from
+# the measured statement time and kept inside these bounds.
+ESDE_BATCH_SIZE = getattr(settings, "ESDE_BATCH_SIZE", 500)
+ESDE_BATCH_SIZE_MIN = getattr(settings, "ESDE_BATCH_SIZE_MIN", 50)
+ESDE_BATCH_SIZE_MAX = getattr(settings, "ESDE_BATCH_SIZE_MAX", 5000)
+ESDE_BATCH_TARGET_SECONDS = getattr(settings, "ESDE_BATCH_TARGET_SECONDS", 0.5)
+# How many batches worth of models are read from the SDE before writing
+ESDE_BATCHES_PER_FLUSH = getattr(settings, "ESDE_BATCHES_PER_FLUSH", 10)
 
-# EXAMPLE_SETTING_ONE = getattr(settings, "EXAMPLE_SETTING_ONE", None)
+# Run each SDE section import in a single transaction so a failed section
+# leaves the previous data in place, with a savepoint every N batches.
+ESDE_IMPORT_ATOMIC = getattr(settings, "ESDE_IMPORT_ATOMIC", False)
+ESDE_IMPORT_SAVEPOINT_BATCHES = getattr(settings, "ESDE_IMPORT_SAVEPOINT_BATCHES", 10)
+# PostgreSQL settings applied for the duration of an atomic section import
+# eg {"synchronous_commit": "off", "work_mem": "64MB"}
+ESDE_PG_IMPORT_SETTINGS = getattr(settings, "ESDE_PG_IMPORT_SETTINGS", {})
+
+# PostgreSQL only, ANALYZE (and optionally VACUUM) each section table after it loads
+ESDE_PG_ANALYZE = getattr(settings, "ESDE_PG_ANALYZE", False)
+ESDE_PG_VACUUM = getattr(settings, "ESDE_PG_VACUUM", False)
+
+# Languages whose translation columns are filled in by an import, eg
+# ["de", "fr"], English is always imported. None imports every language
+# in LANGUAGES, the other columns are left empty and fall back to English,
+# removing a language empties its columns on the next import.
+ESDE_LANGUAGES = getattr(settings, "ESDE_LANGUAGES", None)
+
+# How often (seconds) a process checks the database for a new SDE build
+# before rebuilding anything it has cached for the current one.
+ESDE_BUILD_CHECK_SECONDS = getattr(settings, "ESDE_BUILD_CHECK_SECONDS", 60)
+# Number of gate routes kept in each process' LRU cache
+ESDE_ROUTE_CACHE_SIZE = getattr(settings, "ESDE_ROUTE_CACHE_SIZE", 10000)
+
+# Model.cached lookups, instances kept per model in each process' LRU and
+# how long (seconds) they stay in the Django cache.
+ESDE_MODEL_CACHE_SIZE = getattr(settings, "ESDE_MODEL_CACHE_SIZE", 10000)
+ESDE_MODEL_CACHE_TIMEOUT = getattr(settings, "ESDE_MODEL_CACHE_TIMEOUT", 60 * 60 * 24)
+
+# Folder for the files built after an import, shared by all web/celery
+# processes on the host. Relative to the working directory like the SDE folder.
+ESDE_DATA_DIR = getattr(settings, "ESDE_DATA_DIR", "eve-sde-data")
+# Processes used to build the all pairs jump matrix, None for all cores
+ESDE_JUMP_MATRIX_PROCESSES = getattr(settings, "ESDE_JUMP_MATRIX_PROCESSES", None)
+# Jump ranges (LY) served from the neighbour lists built after an import,
+# the lists are built for the largest range and cover every smaller one.
+ESDE_JUMP_RANGES = getattr(settings, "ESDE_JUMP_RANGES", [5, 6, 7, 8, 10])
@@ -43,4 +43,9 @@ def register_menu():
 def register_urls():
     """Register app urls"""
 
-    return UrlHook(urls, "esde", r"^esde/")
+    return UrlHook(
+        urls,
+        "esde",
+        r"^esde/",
+        excluded_views=["eve_sde.views.universe_bundle"]
+    )
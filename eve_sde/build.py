@@ -0,0 +1,83 @@
+"""
+    Helpers for data derived from the SDE that only changes with the build
+"""
+# Standard Library
+import threading
+import time
+from functools import wraps
+
+from . import app_settings
+
+_build_number = None
+_checked_at = 0.0
+
+
+def current_build_number():
+    """
+    The loaded SDE build, re-read from the database at most every
+    `ESDE_BUILD_CHECK_SECONDS`.
+    """
+    global _build_number, _checked_at
+    if time.monotonic() - _checked_at > app_settings.ESDE_BUILD_CHECK_SECONDS:
+        # AA Example App
+        from eve_sde.models import EveSDE
+
+        _build_number = EveSDE.get_solo().build_number
+        _checked_at = time.monotonic()
+    return _build_number
+
+
+def reset_build_number():
+    """
+    Force the next `current_build_number` call to read the database.
+    """
+    global _checked_at
+    _checked_at = 0.0
+
+
+def per_build(func):
+    """
+    Cache the result of a function without arguments until the SDE build
+    changes. `func.cache_clear()` drops the cached value.
+    """
+    _cache = {}
+    _lock = threading.Lock()
+
+    @wraps(func)
+    def wrapper():
+        build = current_build_number()
+        if _cache.get("build", object()) != build:
+            with _lock:
+                if _cache.get("build", object()) != build:
+                    _cache["value"] = func()
+                    _cache["build"] = build
+        return _cache["value"]
+
+    wrapper.cache_clear = _cache.clear
+    return wrapper
+
+
+def per_build_loaded(func):
+    """
+    `per_build` for loading a file written by a post import step. None (the
+    file is not written yet) is never cached, so a process that asks before
+    the step finishes loads the file on its first call after.
+    """
+    _cache = {}
+    _lock = threading.Lock()
+
+    @wraps(func)
+    def wrapper():
+        build = current_build_number()
+        if _cache.get("build", object()) != build:
+            with _lock:
+                if _cache.get("build", object()) != build:
+                    value = func()
+                    if value is None:
+                        return None
+                    _cache["value"] = value
+                    _cache["build"] = build
+        return _cache["value"]
+
+    wrapper.cache_clear = _cache.clear
+    return wrapper
@@ -0,0 +1,86 @@
+"""
+    Database helpers for the SDE import
+"""
+# Standard Library
+import logging
+import time
+from contextlib import contextmanager
+
+# Django
+from django.db import connections, transaction
+
+from . import app_settings
+
+logger = logging.getLogger(__name__)
+
+
+def is_postgres(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def apply_pg_import_settings(using="default"):
+    """
+    Apply `ESDE_PG_IMPORT_SETTINGS` to the current transaction only.
+    """
+    if not app_settings.ESDE_PG_IMPORT_SETTINGS or not is_postgres(using):
+        return
+    with connections[using].cursor() as cursor:
+        for _name, _value in app_settings.ESDE_PG_IMPORT_SETTINGS.items():
+            # is_local=true is the same as SET LOCAL
+            cursor.execute("SELECT set_config(%s, %s, true)", [_name, str(_value)])
+            logger.debug(f"SET LOCAL {_name} = {_value}")
+
+
+@contextmanager
+def import_transaction(using="default"):
+    """
+    Wrap a section import in one transaction when `ESDE_IMPORT_ATOMIC` is set.
+    """
+    if not app_settings.ESDE_IMPORT_ATOMIC:
+        yield
+        return
+    with transaction.atomic(using=using):
+        apply_pg_import_settings(using)
+        yield
+
+
+def savepoint_batches(batches, using="default"):
+    """
+    Wrap every `ESDE_IMPORT_SAVEPOINT_BATCHES` batches in a savepoint when
+    running inside an atomic section import.
+    """
+    every = app_settings.ESDE_IMPORT_SAVEPOINT_BATCHES
+    if not every or not connections[using].in_atomic_block:
+        yield from batches
+        return
+    _batches = iter(batches)
+    done = False
+    while not done:
+        with transaction.atomic(using=using):
+            for _ in range(every):
+                _batch = next(_batches, None)
+                if _batch is None:
+                    done = True
+                    break
+                yield _batch
+
+
+def analyze_table(model, using="default"):
+    """
+    Refresh the planner statistics for a model's table after an import.
+
+    Returns the time taken in seconds or None when not enabled.
+    """
+    if not app_settings.ESDE_PG_ANALYZE or not is_postgres(using):
+        return None
+    start = time.perf_counter()
+    table = connections[using].ops.quote_name(model._meta.db_table)
+    command = "ANALYZE"
+    if app_settings.ESDE_PG_VACUUM and not connections[using].in_atomic_block:
+        # VACUUM can not run inside a transaction
+        command = "VACUUM ANALYZE"
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"{command} {table}")
+    _seconds = time.perf_counter() - start
+    logger.info(f"{command} {model._meta.db_table} took {_seconds:,.2f}s")
+    return _seconds
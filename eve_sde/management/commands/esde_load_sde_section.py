@@ -1,19 +1,47 @@
+# Standard Library
+import json
+import resource
+
 # Django
 from django.core.management.base import BaseCommand
 
 # AA Example App
 from eve_sde.sde_tasks import (
+    SECTION_STATS_PREFIX,
     download_extract_sde,
-    process_from_sde,
     process_section_of_sde,
 )
 
 
 class Command(BaseCommand):
-    help = "Load SDE"
+    help = "Load a single SDE section"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "section",
+            type=int,
+            help="Index of the section in SDE_PARTS_TO_UPDATE"
+        )
+        parser.add_argument(
+            "--skip-download",
+            action="store_true",
+            help="Use the already extracted SDE folder"
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Output the section stats as json for a parent process"
+        )
 
     def handle(self, *args, **options):
-        download_extract_sde()
-        # process_from_sde()
-        # process_section_of_sde(8)
-        process_section_of_sde(7)
+        if not options["skip_download"]:
+            download_extract_sde()
+        stats = process_section_of_sde(options["section"])
+        stats["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if options["json"]:
+            self.stdout.write(f"{SECTION_STATS_PREFIX}{json.dumps(stats)}")
+        else:
+            self.stdout.write(
+                f"{stats['section']} - {stats['total_rows']}/{stats['total_lines']} "
+                f"in {stats['seconds']:,.2f}s"
+            )
@@ -0,0 +1,17 @@
+# Standard Library
+import time
+
+# Django
+from django.core.management.base import BaseCommand
+
+from ...sde_tasks import SDE_POST_IMPORT_STEPS, process_post_import_step
+
+
+class Command(BaseCommand):
+    help = "Run the post import steps (jump matrix etc) for the loaded SDE"
+
+    def handle(self, *args, **options):
+        for id, step in enumerate(SDE_POST_IMPORT_STEPS):
+            start = time.perf_counter()
+            process_post_import_step(id)
+            self.stdout.write(f"{step.__name__} took {time.perf_counter() - start:,.2f}s")
@@ -0,0 +1,90 @@
+# Third Party
+from modeltranslation.translator import NotRegistered, translator
+from modeltranslation.utils import (
+    build_localized_fieldname,
+    get_language,
+    resolution_order,
+)
+
+# Django
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+
+
+def translation_columns(model):
+    """
+    Every `<field>_<lang>` column of `model`, empty if it is not translated.
+    """
+    try:
+        opts = translator.get_options_for_model(model)
+    except NotRegistered:
+        return set()
+    return {f.name for translations in opts.all_fields.values() for f in translations}
+
+
+def _language_code(lang):
+    """
+    The LANGUAGES code for `lang`, eg "ko" -> "ko-kr".
+    """
+    # AA Example App
+    from eve_sde.models.utils import lang_key
+
+    return lang_key(lang.lower().replace("-", "_")).replace("_", "-")
+
+
+def deferred_translations(model, lang=None):
+    """
+    The translation columns of `model` not read for `lang` (default the
+    active language), every language but it and its fallbacks.
+    """
+    try:
+        opts = translator.get_options_for_model(model)
+    except NotRegistered:
+        return []
+    lang = _language_code(lang) if lang else get_language()
+    deferred = []
+    for field, translations in opts.all_fields.items():
+        keep = {
+            build_localized_fieldname(field, _lang)
+            for _lang in resolution_order(lang, getattr(model, field).fallback_languages)
+        }
+        deferred += sorted(f.name for f in translations if f.name not in keep)
+    return deferred
+
+
+def _is_translation_column(model, path):
+    *relations, name = path.split("__")
+    try:
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+    except (FieldDoesNotExist, AttributeError):
+        return False
+    return model is not None and name in translation_columns(model)
+
+
+class LocalizedQuerySet(models.QuerySet):
+    def localized(self, lang=None, related=()):
+        """
+        Only load the translation columns needed for `lang` (default the
+        active language) and its fallbacks, also for the `related` fields
+        given to `select_related`. Replaces the translation columns deferred
+        by an earlier `localized()`.
+        """
+        deferred = deferred_translations(self.model, lang)
+        for path in related:
+            model = self.model
+            for part in path.split("__"):
+                model = model._meta.get_field(part).related_model
+            deferred += [f"{path}__{name}" for name in deferred_translations(model, lang)]
+        clone = self._chain()
+        existing, defer = clone.query.deferred_loading
+        if defer:
+            clone.query.deferred_loading = (
+                frozenset(f for f in existing if not _is_translation_column(self.model, f)),
+                True
+            )
+        return clone.defer(*deferred) if deferred else clone
+
+
+class LocalizedManager(models.Manager.from_queryset(LocalizedQuerySet)):
+    pass
@@ -1,12 +1,43 @@
 # Django
 from django.db import models
 
+from .localized import LocalizedManager, LocalizedQuerySet
 
-class PlanetManager(models.Manager):
+
+class PlanetQuerySet(LocalizedQuerySet):
+    def with_relations(self):
+        """
+        Join the solar system, `localized_name` does not need it.
+        """
+        return self.select_related("solar_system").localized(related=["solar_system"])
+
+
+class PlanetManager(models.Manager.from_queryset(PlanetQuerySet)):
     def get_queryset(self):
-        return super().get_queryset().select_related("solar_system")
+        return super().get_queryset().localized()
+
 
+class MoonQuerySet(LocalizedQuerySet):
+    def with_relations(self):
+        """
+        Join the solar system, planet and moon type, `localized_name` does
+        not need them.
+        """
+        related = ["solar_system", "item_type", "planet"]
+        return self.select_related(*related).localized(related=related)
 
-class MoonManager(models.Manager):
+
+class MoonManager(models.Manager.from_queryset(MoonQuerySet)):
     def get_queryset(self):
-        return super().get_queryset().select_related("solar_system", "item_type", "planet")
+        return super().get_queryset().localized()
+
+
+class SolarSystemManager(LocalizedManager):
+    def in_jump_range(self, system_id, ly):
+        """
+        Systems within `ly` light years of `system_id`, excluding itself.
+        """
+        # AA Example App
+        from eve_sde.navigation.neighbours import systems_within_ly
+
+        return self.filter(id__in=[_id for _id, _ly in systems_within_ly(system_id, ly)])
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:52
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("eve_sde", "0011_alter_moon_planet_alter_moon_solar_system_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evesdesection",
+            name="maintenance_seconds",
+            field=models.FloatField(blank=True, default=None, null=True),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:53
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_hierarchy(apps, schema_editor):
+    """
+    Fill the new columns from the existing rows, the next SDE import will
+    keep them up to date.
+    """
+    Constellation = apps.get_model("eve_sde", "Constellation")
+    SolarSystem = apps.get_model("eve_sde", "SolarSystem")
+    Planet = apps.get_model("eve_sde", "Planet")
+    Moon = apps.get_model("eve_sde", "Moon")
+
+    SolarSystem.objects.update(
+        region_id=Subquery(
+            Constellation.objects.filter(id=OuterRef("constellation_id")).values("region_id")[:1]
+        )
+    )
+    systems = SolarSystem.objects.filter(id=OuterRef("solar_system_id"))
+    for model in (Planet, Moon):
+        model.objects.update(
+            constellation_id=Subquery(systems.values("constellation_id")[:1]),
+            region_id=Subquery(systems.values("region_id")[:1]),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("eve_sde", "0012_evesdesection_maintenance_seconds"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="moon",
+            name="constellation",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="moons",
+                to="eve_sde.constellation",
+            ),
+        ),
+        migrations.AddField(
+            model_name="moon",
+            name="region",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="moons",
+                to="eve_sde.region",
+            ),
+        ),
+        migrations.AddField(
+            model_name="planet",
+            name="constellation",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="planets",
+                to="eve_sde.constellation",
+            ),
+        ),
+        migrations.AddField(
+            model_name="planet",
+            name="region",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="planets",
+                to="eve_sde.region",
+            ),
+        ),
+        migrations.AddField(
+            model_name="solarsystem",
+            name="region",
+            field=models.ForeignKey(
+                blank=True,
+                default=None,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="solar_systems",
+                to="eve_sde.region",
+            ),
+        ),
+        migrations.RunPython(backfill_hierarchy, migrations.RunPython.noop),
+    ]
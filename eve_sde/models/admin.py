@@ -8,3 +8,4 @@ class EveSDESection(models.Model):
     last_update = models.DateTimeField()
     total_lines = models.IntegerField()
     total_rows = models.IntegerField()
+    maintenance_seconds = models.FloatField(null=True, blank=True, default=None)
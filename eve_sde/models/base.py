@@ -1,19 +1,49 @@
 # Standard Library
 import json
 import logging
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 
 # Django
 from django.db import models
 from django.utils.translation import gettext as _
 
+from ..db import savepoint_batches
+from ..managers.localized import LocalizedManager
 from .admin import EveSDESection
-from .utils import get_langs, get_langs_for_field, lang_key, val_from_dict
+from .batching import AdaptiveBatcher
+from .cached import CachedLookup
+from .utils import (
+    get_import_langs,
+    get_import_langs_for_field,
+    get_langs,
+    lang_key,
+    val_from_dict,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache
+def translation_defaults(model):
+    """
+    {field: default} of the translation columns of `model`. Given to the
+    constructor they skip modeltranslation's `get_default()`, which
+    activates the field's language, for every column of every row.
+    """
+    return {
+        f.name: f.get_default()
+        for f in model._meta.concrete_fields if hasattr(f, "translated_field")
+    }
+
+
 class JSONModel(models.Model):
+    # `Model.objects.localized()` skips the other languages' columns
+    objects = LocalizedManager()
+    # `Model.cached.get(pk)` / `Model.cached.get_many(pks)`
+    cached = CachedLookup()
+
     class Import:
         filename = "not_set.jsonl"
         data_map = False
@@ -23,11 +53,13 @@ class JSONModel(models.Model):
 
     @classmethod
     def map_to_model(cls, json_data, name_lookup=False, pk=True):
-        _model = cls()
+        _model = cls(**translation_defaults(cls))
         if pk:
             _model.pk = val_from_dict("_key", json_data)
         for f, k in cls.Import.data_map:
             setattr(_model, f, val_from_dict(k, json_data))
+        if cls.Import.lang_fields or cls.Import.custom_names:
+            langs = get_import_langs()
         if cls.Import.lang_fields:
             for _f in cls.Import.lang_fields:
                 _fld = _f
@@ -35,13 +67,14 @@ class JSONModel(models.Model):
                 if isinstance(_f, tuple):
                     _fld, _key = _f
                 for lang, _val in json_data.get(_key, {}).items():
-                    setattr(_model, f"{_fld}_{lang_key(lang)}", _val)
+                    if lang_key(lang) in langs:
+                        setattr(_model, f"{_fld}_{lang_key(lang)}", _val)
         if cls.Import.custom_names:
-            setattr(_model, "name", cls.format_name(json_data, name_lookup, "en"))
-            for lang in get_langs():
-                _nme = cls.format_name(json_data, name_lookup, lang=lang_key(lang))
-                if _model.name != _nme:
-                    setattr(_model, f"name_{lang_key(lang)}", _nme)
+            names = cls.format_names(json_data, name_lookup, ["en"] + langs)
+            setattr(_model, "name", names["en"])
+            for lang in langs:
+                if names["en"] != names[lang]:
+                    setattr(_model, f"name_{lang}", names[lang])
 
         return _model
 
@@ -68,19 +101,17 @@ class JSONModel(models.Model):
             return data.get(f"name_{lang}")
 
     @classmethod
-    def create_update(cls, create_model_list: list["JSONModel"], update_model_list: list["JSONModel"]):
-        cls.objects.bulk_create(
-            create_model_list,
-            # ignore_conflicts=True,
-            batch_size=500
-        )
+    def format_names(cls, data, name_lookup, langs):
+        """
+        {lang: name} for each of `langs`, override to share work between
+        the languages of a row.
+        """
+        return {lang: cls.format_name(data, name_lookup, lang=lang) for lang in langs}
 
+    @classmethod
+    def get_update_fields(cls):
         if cls.Import.update_fields:
-            cls.objects.bulk_update(
-                update_model_list,
-                cls.Import.update_fields,
-                batch_size=500
-            )
+            return cls.Import.update_fields
         elif cls.Import.data_map:
             _fields = [_f[0] for _f in cls.Import.data_map]
             if cls.Import.lang_fields:
@@ -88,21 +119,84 @@ class JSONModel(models.Model):
                     _fld = _f
                     if isinstance(_f, tuple):
                         _fld, _key = _f
-                    _fields += get_langs_for_field(_fld)
+                    _fields += get_import_langs_for_field(_fld)
             if cls.Import.custom_names:
-                _fields += get_langs_for_field("name")
-            cls.objects.bulk_update(
-                update_model_list,
-                _fields,
-                batch_size=500
+                _fields += get_import_langs_for_field("name")
+            return _fields
+        return []
+
+    @classmethod
+    def translated_import_fields(cls):
+        """
+        The translated fields filled in by the import.
+        """
+        _fields = []
+        for _f in cls.Import.lang_fields or []:
+            _fields.append(_f[0] if isinstance(_f, tuple) else _f)
+        if cls.Import.custom_names:
+            _fields.append("name")
+        return list(dict.fromkeys(_fields))
+
+    @classmethod
+    def clear_dropped_languages(cls):
+        """
+        Empty the columns of languages no longer imported, so they fall back
+        to English rather than keep the text of an older build.
+        """
+        langs = get_import_langs()
+        _columns = [
+            f"{_fld}_{lang}"
+            for _fld in cls.translated_import_fields()
+            for lang in get_langs() if lang not in langs
+        ]
+        if not _columns:
+            return 0
+        query = models.Q()
+        for _c in _columns:
+            query |= models.Q(**{f"{_c}__isnull": False})
+        _cleared = cls.objects.filter(query).update(**{_c: None for _c in _columns})
+        if _cleared:
+            logger.info(f"{cls.__name__} - Cleared {len(_columns)} dropped language columns on {_cleared} rows")
+        return _cleared
+
+    @classmethod
+    def create_batcher(cls):
+        return AdaptiveBatcher.for_model(cls, "create", list(cls._meta.concrete_fields))
+
+    @classmethod
+    def update_batcher(cls, update_fields):
+        return AdaptiveBatcher.for_model(
+            cls,
+            "update",
+            [cls._meta.pk] + [cls._meta.get_field(_f) for _f in update_fields]
+        )
+
+    @classmethod
+    def create_update(cls, create_model_list: list["JSONModel"], update_model_list: list["JSONModel"]):
+        for _batch in savepoint_batches(cls.create_batcher().batches(create_model_list), cls.objects.db):
+            cls.objects.bulk_create(
+                _batch,
+                # ignore_conflicts=True,
+                batch_size=len(_batch)
             )
 
+        _fields = cls.get_update_fields()
+        if _fields:
+            for _batch in savepoint_batches(cls.update_batcher(_fields).batches(update_model_list), cls.objects.db):
+                cls.objects.bulk_update(
+                    _batch,
+                    _fields,
+                    batch_size=len(_batch)
+                )
+
     @classmethod
     def load_from_sde(cls, folder_name):
+        start = time.perf_counter()
         _creates = []
         _updates = []
 
         name_lookup = cls.name_lookup()
+        batcher = cls.create_batcher()
 
         pks = set(
             cls.objects.all().values_list("pk", flat=True)
@@ -143,7 +237,7 @@ class JSONModel(models.Model):
                         _creates.append(_new)
                     total_read += 1
 
-                if (len(_creates) + len(_updates)) >= 5000:
+                if (len(_creates) + len(_updates)) >= batcher.flush_size():
                     # lets batch these to reduce memory overhead
                     logger.info(
                         f"{file_path} - "
@@ -161,18 +255,28 @@ class JSONModel(models.Model):
             )
             cls.create_update(_creates, _updates)
 
+        cls.clear_dropped_languages()
+
         _complete = cls.objects.all().count()
         if _complete != total_lines and _complete != total_read:
             logger.warning(
                 f"{file_path} - Found {_complete}/{total_lines if _complete == total_lines else total_read} items after completing import."
             )
 
+        _total = total_lines if _complete == total_lines else total_read
         cls.update_sde_section_state(
             folder_name,
             cls.__name__,
-            total_lines if _complete == total_lines else total_read, _complete
+            _total, _complete
         )
 
+        return {
+            "section": cls.__name__,
+            "total_lines": _total,
+            "total_rows": _complete,
+            "seconds": time.perf_counter() - start,
+        }
+
     @classmethod
     def update_sde_section_state(cls, folder_name: str, section: str, total_lines: int, total_rows: int):
         build = 0
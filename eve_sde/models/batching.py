@@ -0,0 +1,130 @@
+"""
+    Adaptive batch sizing for the bulk writes done during an SDE import.
+"""
+# Standard Library
+import logging
+import time
+
+# Django
+from django.db import connections
+
+from .. import app_settings
+
+logger = logging.getLogger(__name__)
+
+# Fraction of the mysql max_allowed_packet we are willing to fill
+PACKET_HEADROOM = 0.5
+# Per value overhead for quoting/separators when estimating statement size
+VALUE_OVERHEAD_BYTES = 4
+# Limit how quickly a batch size can change between statements
+MAX_GROWTH = 2.0
+# Smoothing for the per row latency
+EWMA_WEIGHT = 0.3
+
+
+class AdaptiveBatcher:
+    """
+    Picks the batch size for one bulk operation on one model.
+
+    The size is chosen from the smoothed per row statement time so each
+    statement takes roughly `ESDE_BATCH_TARGET_SECONDS`, then capped by the
+    configured bounds and by what the database backend will accept.
+    """
+    _batchers = {}
+
+    def __init__(self, model, operation, fields):
+        self.model = model
+        self.operation = operation
+        self.fields = fields
+        self.size = app_settings.ESDE_BATCH_SIZE
+        self.row_seconds = None
+        self._backend_limit = None
+
+    @classmethod
+    def for_model(cls, model, operation, fields):
+        key = (model._meta.label, operation)
+        _batcher = cls._batchers.get(key)
+        if _batcher is None or _batcher.fields != fields:
+            _batcher = cls(model, operation, fields)
+            cls._batchers[key] = _batcher
+        return _batcher
+
+    @property
+    def connection(self):
+        return connections[self.model.objects.db]
+
+    def row_bytes(self, objs):
+        """
+        Rough size of a row in the statement from a sample of the models.
+        """
+        sample = objs[:20]
+        if not sample:
+            return 1
+        _bytes = 0
+        for obj in sample:
+            for f in self.fields:
+                _bytes += len(str(getattr(obj, f.attname))) + VALUE_OVERHEAD_BYTES
+        _bytes = _bytes / len(sample)
+        if self.operation == "update":
+            # bulk_update writes a `WHEN pk THEN value` per field
+            _bytes *= 2
+        return max(int(_bytes), 1)
+
+    def max_packet_size(self):
+        if self.connection.vendor != "mysql":
+            return None
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT @@max_allowed_packet")
+            return int(cursor.fetchone()[0])
+
+    def backend_limit(self, objs):
+        """
+        Largest batch the backend will accept for these models.
+        """
+        if self._backend_limit is None:
+            limit = self.connection.ops.bulk_batch_size(self.fields, objs)
+            packet = self.max_packet_size()
+            if packet:
+                limit = min(limit, int(packet * PACKET_HEADROOM / self.row_bytes(objs)))
+            self._backend_limit = max(limit, 1)
+        return self._backend_limit
+
+    def record(self, rows, seconds):
+        if not rows:
+            return
+        _row_seconds = seconds / rows
+        if self.row_seconds is None:
+            self.row_seconds = _row_seconds
+        else:
+            self.row_seconds = EWMA_WEIGHT * _row_seconds + (1 - EWMA_WEIGHT) * self.row_seconds
+
+    def next_size(self, objs):
+        size = self.size
+        if self.row_seconds:
+            wanted = app_settings.ESDE_BATCH_TARGET_SECONDS / self.row_seconds
+            size = int(min(max(wanted, size / MAX_GROWTH), size * MAX_GROWTH))
+        size = max(min(size, app_settings.ESDE_BATCH_SIZE_MAX), app_settings.ESDE_BATCH_SIZE_MIN)
+        size = max(min(size, self.backend_limit(objs)), 1)
+        if size != self.size:
+            logger.info(
+                f"{self.model.__name__} {self.operation} batch size {self.size} -> {size}"
+                f" ({(self.row_seconds or 0) * 1000:.3f}ms/row)"
+            )
+            self.size = size
+        return size
+
+    def flush_size(self):
+        return self.size * app_settings.ESDE_BATCHES_PER_FLUSH
+
+    def batches(self, objs):
+        """
+        Yield the models in batches, timing whatever the caller does with each.
+        """
+        i = 0
+        while i < len(objs):
+            size = self.next_size(objs)
+            batch = objs[i:i + size]
+            start = time.perf_counter()
+            yield batch
+            self.record(len(batch), time.perf_counter() - start)
+            i += size
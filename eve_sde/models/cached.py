@@ -0,0 +1,122 @@
+"""
+    Build versioned read through cache for SDE model lookups.
+"""
+# Standard Library
+import threading
+from collections import OrderedDict
+
+# Third Party
+from modeltranslation.utils import get_language
+
+# Django
+from django.core.cache import cache
+
+from .. import app_settings
+from ..build import current_build_number
+
+# Cached for pks that are not in the database
+MISSING = "esde-missing"
+
+
+class ModelCache:
+    """
+    `Model.cached`, primary key lookups for one model.
+
+    Reads go to a process local LRU, then the Django cache, then the
+    database. Every key holds the SDE build number so a new build misses
+    everything at once, older entries age out of the LRU and expire from
+    the Django cache. Pks that do not exist are cached as `MISSING` too.
+    Instances are loaded `localized()` and cached per active language, the
+    other languages' columns are deferred and reading one runs a query.
+    Cached instances are shared, treat them as read only.
+    """
+    _caches = {}
+
+    def __init__(self, model):
+        self.model = model
+        self.local = OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_model(cls, model):
+        if model not in cls._caches:
+            cls._caches[model] = cls(model)
+        return cls._caches[model]
+
+    def cache_key(self, build, lang, pk):
+        return f"esde-{build}-{lang}-{self.model._meta.label_lower}-{pk}"
+
+    def _local_get(self, key):
+        with self.lock:
+            if key in self.local:
+                self.local.move_to_end(key)
+                return self.local[key]
+        return None
+
+    def _local_set(self, key, obj):
+        with self.lock:
+            self.local[key] = obj
+            self.local.move_to_end(key)
+            while len(self.local) > app_settings.ESDE_MODEL_CACHE_SIZE:
+                self.local.popitem(last=False)
+
+    def get_many(self, pks):
+        """
+        {pk: instance} of the pks that exist, like `in_bulk`.
+        """
+        build = current_build_number()
+        lang = get_language()
+        found = {}
+        missing = []
+        for pk in dict.fromkeys(pks):
+            obj = self._local_get((build, lang, pk))
+            if obj is None:
+                missing.append(pk)
+            else:
+                found[pk] = obj
+
+        if missing:
+            keys = {self.cache_key(build, lang, pk): pk for pk in missing}
+            for key, obj in cache.get_many(list(keys)).items():
+                found[keys[key]] = obj
+                self._local_set((build, lang, keys[key]), obj)
+            missing = [pk for pk in missing if pk not in found]
+
+        if missing:
+            loaded = self.model._default_manager.localized(lang).in_bulk(missing)
+            loaded = {pk: loaded.get(pk, MISSING) for pk in missing}
+            cache.set_many(
+                {self.cache_key(build, lang, pk): obj for pk, obj in loaded.items()},
+                app_settings.ESDE_MODEL_CACHE_TIMEOUT
+            )
+            for pk, obj in loaded.items():
+                found[pk] = obj
+                self._local_set((build, lang, pk), obj)
+        return {pk: obj for pk, obj in found.items() if obj != MISSING}
+
+    def get(self, pk):
+        """
+        The instance with `pk`, raises `DoesNotExist` like `objects.get`.
+        """
+        obj = self.get_many([pk]).get(pk)
+        if obj is None:
+            raise self.model.DoesNotExist(f"{self.model.__name__} {pk} does not exist.")
+        return obj
+
+    def clear(self):
+        """
+        Empty this process' LRU, the Django cache keeps its entries.
+        """
+        with self.lock:
+            self.local.clear()
+
+
+class CachedLookup:
+    """
+    Class attribute giving each concrete model its own `ModelCache`.
+    """
+
+    def __get__(self, instance, owner):
+        if instance is not None:
+            raise AttributeError("cached is only accessible from the model class")
+        return ModelCache.for_model(owner)
@@ -3,12 +3,11 @@
 """
 # Django
 from django.db import models
-from django.utils.translation import gettext_lazy as _
 
-from ..managers.map import MoonManager, PlanetManager
+from ..managers.map import MoonManager, PlanetManager, SolarSystemManager
 from .base import JSONModel
 from .types import ItemType
-from .utils import get_langs_for_field, to_roman_numeral
+from .utils import get_import_langs_for_field, to_roman_numeral
 
 
 class UniverseBase(JSONModel):
@@ -169,6 +168,7 @@ class SolarSystem(UniverseBase):
             ("luminosity", "luminosity"),
             ("name", "name.en"),
             ("radius", "radius"),
+            ("region_id", "regionID"),
             ("regional", "regional"),
             ("security_class", "securityClass"),
             ("security_status", "securityStatus"),
@@ -184,6 +184,8 @@ class SolarSystem(UniverseBase):
         update_fields = False
         custom_names = False
 
+    objects = SolarSystemManager()
+
     # Model Fields
     border = models.BooleanField(null=True, blank=True, default=False)
     constellation = models.ForeignKey(Constellation, on_delete=models.SET_NULL, null=True, blank=True, default=None)
@@ -194,6 +196,14 @@ class SolarSystem(UniverseBase):
     international = models.BooleanField(null=True, blank=True, default=False)
     luminosity = models.FloatField(null=True, blank=True, default=None)
     radius = models.FloatField(null=True, blank=True, default=None)
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.SET_NULL,
+        related_name="solar_systems",
+        null=True,
+        blank=True,
+        default=None
+    )
     regional = models.BooleanField(null=True, blank=True, default=False)
     security_class = models.CharField(max_length=5, null=True, blank=True, default=None)
     security_status = models.FloatField(null=True, blank=True, default=None)
@@ -280,7 +290,7 @@ class Stargate(UniverseBase):
         if gate_qry.exists():
             # speed and we are not caring about f-keys or signals on these models
             gate_qry._raw_delete(gate_qry.db)
-        super().load_from_sde(folder_name)
+        return super().load_from_sde(folder_name)
 
 
 class Planet(UniverseBase):
@@ -313,8 +323,10 @@ class Planet(UniverseBase):
         custom_names = True
         data_map = (
             ("celestial_index", "celestialIndex"),
+            ("constellation_id", "constellationID"),
             ("orbit_id_raw", "orbitID"),
             ("radius", "radius"),
+            ("region_id", "regionID"),
             ("solar_system_id", "solarSystemID"),
             ("item_type_id", "typeID"),
             ("x", "position.x"),
@@ -325,6 +337,15 @@ class Planet(UniverseBase):
     objects = PlanetManager()
 
     celestial_index = models.IntegerField(null=True, blank=True, default=None)
+    # Denormalized from the solar system
+    constellation = models.ForeignKey(
+        Constellation,
+        on_delete=models.SET_NULL,
+        related_name="planets",
+        null=True,
+        blank=True,
+        default=None
+    )
     item_type = models.ForeignKey(
         ItemType,
         on_delete=models.CASCADE,
@@ -336,6 +357,15 @@ class Planet(UniverseBase):
     orbit_id_raw = models.IntegerField(null=True, blank=True, default=None)
     orbit_index = models.IntegerField(null=True, blank=True, default=None)
     radius = models.IntegerField(null=True, blank=True, default=None)
+    # Denormalized from the solar system
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.SET_NULL,
+        related_name="planets",
+        null=True,
+        blank=True,
+        default=None
+    )
     solar_system = models.ForeignKey(
         SolarSystem,
         on_delete=models.CASCADE,
@@ -352,16 +382,28 @@ class Planet(UniverseBase):
 
     @property
     def localized_name(self):
-        return f"{_(self.solar_system.name)} {to_roman_numeral(self.celestial_index)}"
+        # the active language's `name_<lang>`, built by `format_name` on import
+        return self.name
 
     @classmethod
     def name_lookup(cls):
-        _langs = get_langs_for_field("name")
+        _langs = get_import_langs_for_field("name")
         return {
             s.get("id"): s for s in
-            SolarSystem.objects.all().values("id", "name", *_langs)
+            SolarSystem.objects.all().values("id", "name", "constellation_id", "region_id", *_langs)
         }
 
+    @classmethod
+    def from_jsonl(cls, json_data, system_names):
+        system = system_names[json_data.get("solarSystemID")]
+        return super().from_jsonl(
+            json_data | {
+                "constellationID": system["constellation_id"],
+                "regionID": system["region_id"],
+            },
+            system_names
+        )
+
     @classmethod
     def format_name(cls, json_data, system_names, lang: str = None):
         system = system_names[json_data.get('solarSystemID')][f"name_{lang}"]
@@ -369,6 +411,15 @@ class Planet(UniverseBase):
             system = system_names[json_data.get('solarSystemID')][f"name"]
         return f"{system} {to_roman_numeral(json_data.get('celestialIndex'))}"
 
+    @classmethod
+    def format_names(cls, json_data, system_names, langs):
+        """
+        The numeral is formatted once for all languages.
+        """
+        system = system_names[json_data.get('solarSystemID')]
+        numeral = to_roman_numeral(json_data.get('celestialIndex'))
+        return {lang: f"{system[f'name_{lang}'] or system['name']} {numeral}" for lang in langs}
+
 
 class Moon(UniverseBase):
     """
@@ -401,11 +452,13 @@ class Moon(UniverseBase):
         custom_names = True
         data_map = (
             ("celestial_index", "celestialIndex"),
+            ("constellation_id", "constellationID"),
             ("item_type_id", "typeID"),
             ("orbit_id_raw", "orbitID"),
             ("orbit_index", "orbitIndex"),
             ("planet_id", "orbitID"),
             ("radius", "radius"),
+            ("region_id", "regionID"),
             ("solar_system_id", "solarSystemID"),
             ("x", "position.x"),
             ("y", "position.y"),
@@ -415,6 +468,15 @@ class Moon(UniverseBase):
     objects = MoonManager()
 
     celestial_index = models.IntegerField(null=True, blank=True, default=None)
+    # Denormalized from the solar system
+    constellation = models.ForeignKey(
+        Constellation,
+        on_delete=models.SET_NULL,
+        related_name="moons",
+        null=True,
+        blank=True,
+        default=None
+    )
     item_type = models.ForeignKey(
         ItemType,
         on_delete=models.CASCADE,
@@ -434,6 +496,15 @@ class Moon(UniverseBase):
         default=None
     )
     radius = models.IntegerField(null=True, blank=True, default=None)
+    # Denormalized from the solar system
+    region = models.ForeignKey(
+        Region,
+        on_delete=models.SET_NULL,
+        related_name="moons",
+        null=True,
+        blank=True,
+        default=None
+    )
     solar_system = models.ForeignKey(
         SolarSystem,
         on_delete=models.CASCADE,
@@ -448,14 +519,15 @@ class Moon(UniverseBase):
 
     @property
     def localized_name(self):
-        return f"{_(self.solar_system.name)} {to_roman_numeral(self.celestial_index)} - {_(self.item_type.name)} {self.orbit_index}"
+        # the active language's `name_<lang>`, built by `format_name` on import
+        return self.name
 
     @classmethod
     def name_lookup(cls):
-        _langs = get_langs_for_field("name")
+        _langs = get_import_langs_for_field("name")
         planets = {
             s.get("id"): s for s in
-            Planet.objects.all().values("id", "name", *_langs)
+            Planet.objects.all().values("id", "name", "constellation_id", "region_id", *_langs)
         }
         item_types = {
             s.get("id"): s for s in
@@ -463,11 +535,25 @@ class Moon(UniverseBase):
         }
         return {
             "planet": planets,
-            "item_type": item_types
+            "item_type": item_types,
+            # ((planet id, type id), {lang: "planet - moon type"}) of the last
+            # row, moons are read grouped by planet
+            "prefix": None,
         }
 
     @classmethod
-    def format_name(cls, json_data, name_lookup, lang):
+    def from_jsonl(cls, json_data, name_lookup):
+        planet = name_lookup["planet"][json_data.get("orbitID")]
+        return super().from_jsonl(
+            json_data | {
+                "constellationID": planet["constellation_id"],
+                "regionID": planet["region_id"],
+            },
+            name_lookup
+        )
+
+    @classmethod
+    def name_prefix(cls, json_data, name_lookup, lang):
         planet = name_lookup["planet"][json_data.get('orbitID')][f"name_{lang}"]
         if not planet:
             planet = name_lookup["planet"][json_data.get('orbitID')][f"name"]
@@ -476,6 +562,24 @@ class Moon(UniverseBase):
         if not moon:
             moon = name_lookup["item_type"].get(json_data.get("typeID"), {}).get(f"name", "Moon")
 
-        return (
-            f"{planet} - {moon} {json_data.get('orbitIndex')}"
-        )
+        return f"{planet} - {moon}"
+
+    @classmethod
+    def format_name(cls, json_data, name_lookup, lang):
+        return f"{cls.name_prefix(json_data, name_lookup, lang)} {json_data.get('orbitIndex')}"
+
+    @classmethod
+    def format_names(cls, json_data, name_lookup, langs):
+        """
+        The "planet - moon type" prefixes are formatted once for each run of
+        moons of the same planet and type, only the orbit index is added per
+        row. Only the current planet's prefixes are kept.
+        """
+        key = (json_data.get("orbitID"), json_data.get("typeID"))
+        if name_lookup["prefix"] is None or name_lookup["prefix"][0] != key:
+            name_lookup["prefix"] = (
+                key, {lang: cls.name_prefix(json_data, name_lookup, lang) for lang in langs}
+            )
+        prefixes = name_lookup["prefix"][1]
+        suffix = f" {json_data.get('orbitIndex')}"
+        return {lang: prefix + suffix for lang, prefix in prefixes.items()}
@@ -230,7 +230,7 @@ class ItemTypeMaterials(JSONModel):
         if gate_qry.exists():
             # speed and we are not caring about f-keys or signals on these models
             gate_qry._raw_delete(gate_qry.db)
-        super().load_from_sde(folder_name)
+        return super().load_from_sde(folder_name)
 
     class Meta:
         default_permissions = ()
@@ -503,7 +503,7 @@ class TypeDogma(JSONModel):
         if gate_qry.exists():
             # speed and we are not caring about f-keys or signals on these models
             gate_qry._raw_delete(gate_qry.db)
-        super().load_from_sde(folder_name)
+        return super().load_from_sde(folder_name)
 
     class Meta:
         default_permissions = ()
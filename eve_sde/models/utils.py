@@ -5,6 +5,8 @@ from functools import reduce
 # Django
 from django.conf import settings
 
+from .. import app_settings
+
 
 def lang_key(key):
     keys = {
@@ -55,6 +57,22 @@ def get_langs_for_field(field_name):
     return out
 
 
+def get_import_langs():
+    """
+    The configured languages filled in by an import, `ESDE_LANGUAGES` (and
+    English) or all of them.
+    """
+    langs = get_langs()
+    if app_settings.ESDE_LANGUAGES is None:
+        return langs
+    wanted = {"en"} | {lang_key(_l.lower().replace("-", "_")) for _l in app_settings.ESDE_LANGUAGES}
+    return [_l for _l in langs if _l in wanted]
+
+
+def get_import_langs_for_field(field_name):
+    return [f"{field_name}_{_l}" for _l in get_import_langs()]
+
+
 def val_from_dict(key, dict):
     _k = key
     _d = None
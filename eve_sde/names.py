@@ -0,0 +1,149 @@
+"""
+    Bulk id to name resolution, a local /universe/names
+
+    Each language is indexed once per build as one sorted id array with a
+    category code per row and the names packed into a single utf-8 buffer.
+    Ids used by more than one model (type, group and category ids overlap)
+    are resolved in `CATEGORIES` order unless the categories are given.
+"""
+# Standard Library
+from typing import NamedTuple
+
+# Third Party
+import numpy as np
+
+from .build import per_build
+from .models.utils import get_langs, lang_key
+
+
+class ResolvedName(NamedTuple):
+    category: str
+    name: str
+
+
+CATEGORIES = (
+    "inventory_type",
+    "solar_system",
+    "constellation",
+    "region",
+    "planet",
+    "moon",
+    "stargate",
+    "group",
+    "category",
+)
+
+
+def _models():
+    """
+    The model of each of `CATEGORIES`.
+    """
+    # AA Example App
+    from eve_sde.models import (
+        Constellation,
+        ItemCategory,
+        ItemGroup,
+        ItemType,
+        Moon,
+        Planet,
+        Region,
+        SolarSystem,
+        Stargate,
+    )
+
+    return (ItemType, SolarSystem, Constellation, Region, Planet, Moon, Stargate, ItemGroup, ItemCategory)
+
+
+def language_field(lang):
+    """
+    The `name_<lang>` column for `lang`, eg "de", "ko", "zh-hans".
+    """
+    _lang = lang_key(lang.lower().replace("-", "_"))
+    if _lang not in get_langs():
+        raise ValueError(f"Unknown language {lang}, expected one of {get_langs()}")
+    return f"name_{_lang}"
+
+
+class NameIndex:
+
+    def __init__(self, rows):
+        """
+        `rows` are (id, category code, name) tuples.
+        """
+        rows = sorted(rows, key=lambda r: (r[0], r[1]))
+        self.ids = np.array([r[0] for r in rows], dtype=np.int64)
+        self.categories = np.array([r[1] for r in rows], dtype=np.uint8)
+        encoded = [(r[2] or "").encode() for r in rows]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=self.offsets[1:])
+        self.names = b"".join(encoded)
+
+    @classmethod
+    def from_db(cls, field):
+        rows = []
+        for code, model in enumerate(_models()):
+            fields = [_f.name for _f in model._meta.get_fields()]
+            # modeltranslation reads "name" in the active language
+            english = "name_en" if "name_en" in fields else "name"
+            columns = list(dict.fromkeys([field, english] if field in fields else [english]))
+            rows += [
+                (_id, code, names[0] or names[-1])
+                for _id, *names in model.objects.values_list("id", *columns).iterator()
+            ]
+        return cls(rows)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resolve(self, ids, categories=None):
+        """
+        {id: ResolvedName} for every id found, unknown ids are left out.
+        """
+        query = np.unique(np.asarray(list(ids), dtype=np.int64))
+        left = np.searchsorted(self.ids, query, side="left")
+        right = np.searchsorted(self.ids, query, side="right")
+        if categories is None:
+            first = left
+        else:
+            codes = [CATEGORIES.index(c) for c in categories]
+            allowed = np.flatnonzero(np.isin(self.categories, codes))
+            at = np.searchsorted(allowed, left)
+            first = np.append(allowed, len(self.ids))[at]
+        found = first < right
+        out = {}
+        for _id, row in zip(query[found].tolist(), first[found].tolist()):
+            out[_id] = ResolvedName(
+                CATEGORIES[self.categories[row]],
+                self.names[self.offsets[row]:self.offsets[row + 1]].decode()
+            )
+        return out
+
+
+@per_build
+def _name_indexes():
+    return {}
+
+
+def get_name_index(lang="en"):
+    field = language_field(lang)
+    indexes = _name_indexes()
+    if field not in indexes:
+        indexes[field] = NameIndex.from_db(field)
+    return indexes[field]
+
+
+def resolve_names(ids, lang="en", categories=None):
+    """
+    {id: ResolvedName(category, name)} for a mixed list of SDE ids, names
+    in `lang` falling back to English. `categories` limits the lookup to
+    some of `CATEGORIES`.
+    """
+    if categories is not None:
+        unknown = set(categories) - set(CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown categories {unknown}, expected some of {CATEGORIES}")
+    return get_name_index(lang).resolve(ids, categories)
+
+
+def clear_cache():
+    _name_indexes.cache_clear()
@@ -0,0 +1,3 @@
+"""
+    Routing and spatial lookups built from the SDE
+"""
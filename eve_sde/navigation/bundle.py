@@ -0,0 +1,143 @@
+"""
+    Binary universe bundle for non python consumers
+
+    Written after each import so other services can load the map without
+    querying the database. Everything is little endian:
+
+    header, 32 bytes
+        magic       8s   b"ESDEUNI\\0"
+        version     u32  BUNDLE_VERSION
+        sections    u32  number of section table entries
+        build       i64  EveSDE.build_number
+        systems     u32  n
+        edges       u32  directed gate edges
+    section table, 32 bytes per section
+        name        16s  ascii, null padded
+        dtype       4s   numpy dtype string, eg b"<i4\\0"
+        count       u32  number of values
+        offset      u64  from the start of the file, a multiple of 64
+    sections
+        ids               <i8  n      solar system ids, ascending
+        indptr            <i4  n + 1  CSR gate adjacency, the neighbours of
+        indices           <i4  edges  system i are indices[indptr[i]:indptr[i + 1]]
+        coords            <f4  n * 3  x, y, z in light years, NaN if unknown
+        coords_2d         <f4  n * 2  x_2d, y_2d, NaN if unknown
+        security          <f4  n      security status, NaN if unknown
+        region_id         <i4  n      0 if unknown
+        constellation_id  <i4  n      0 if unknown
+
+    Every section is aligned so it can be viewed in place, eg with
+    `numpy.frombuffer` over a memory map or a `Float32Array` in JS.
+"""
+# Standard Library
+import logging
+import mmap
+import os
+import struct
+
+# Third Party
+import numpy as np
+
+from .files import data_path, read_sections, save_file, write_sections
+from .gates import csr
+from .spatial import METRES_PER_LY
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_NAME = "universe"
+BUNDLE_EXT = "bin"
+BUNDLE_MAGIC = b"ESDEUNI\0"
+BUNDLE_VERSION = 1
+HEADER = struct.Struct("<8sIIqII")
+
+
+def compute_bundle(systems, edges):
+    """
+    [(name, array), ...] of the bundle sections.
+
+    `systems` are (id, x, y, z, x_2d, y_2d, security, region_id,
+    constellation_id) rows and `edges` (system id, system id) pairs.
+    """
+    rows = sorted(systems)
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    values = np.array([r[1:7] for r in rows], dtype=np.float64).reshape(-1, 6)
+    groups = np.array([[g or 0 for g in r[7:9]] for r in rows], dtype=np.int32).reshape(-1, 2)
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[np.isin(edges, ids).all(axis=1)]
+    src = np.searchsorted(ids, edges[:, 0]).astype(np.int32)
+    dst = np.searchsorted(ids, edges[:, 1]).astype(np.int32)
+    indptr, indices = csr(src, dst, len(ids))
+    return [
+        ("ids", ids),
+        ("indptr", indptr),
+        ("indices", indices),
+        ("coords", (values[:, 0:3] / METRES_PER_LY).astype(np.float32)),
+        ("coords_2d", values[:, 3:5].astype(np.float32)),
+        ("security", values[:, 5].astype(np.float32)),
+        ("region_id", groups[:, 0]),
+        ("constellation_id", groups[:, 1]),
+    ]
+
+
+def write_bundle(f, build, sections):
+    """
+    Write the `sections` from `compute_bundle` to the binary file `f`.
+    """
+    arrays = dict(sections)
+    write_sections(
+        f,
+        HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(sections), build, len(arrays["ids"]), len(arrays["indices"])),
+        sections
+    )
+
+
+def read_bundle(buffer):
+    """
+    The build number and {name: array} of a bundle, the arrays are views
+    over `buffer` and are never copied.
+    """
+    magic, version, count, build, systems, _ = HEADER.unpack_from(buffer, 0)
+    if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+        raise ValueError(f"Not a version {BUNDLE_VERSION} universe bundle")
+    arrays = read_sections(buffer, HEADER.size, count)
+    arrays["coords"] = arrays["coords"].reshape(systems, 3)
+    arrays["coords_2d"] = arrays["coords_2d"].reshape(systems, 2)
+    return build, arrays
+
+
+def bundle_path(build):
+    return data_path(BUNDLE_NAME, build, BUNDLE_EXT)
+
+
+def load_bundle(build):
+    """
+    Memory map the bundle for `build`, None if it has not been built.
+    """
+    try:
+        with open(bundle_path(build), "rb") as f:
+            return read_bundle(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except FileNotFoundError:
+        return None
+
+
+def build_universe_bundle():
+    """
+    Post import step, save the universe bundle for the current build.
+    """
+    # AA Example App
+    from eve_sde.models import EveSDE, SolarSystem, Stargate
+
+    build = EveSDE.get_solo().build_number
+    sections = compute_bundle(
+        SolarSystem.objects.values_list(
+            "id", "x", "y", "z", "x_2d", "y_2d", "security_status", "region_id", "constellation_id"
+        ),
+        list(
+            Stargate.objects.filter(
+                solar_system__isnull=False,
+                destination__isnull=False
+            ).values_list("solar_system_id", "destination_id")
+        )
+    )
+    path = save_file(BUNDLE_NAME, build, lambda f: write_bundle(f, build, sections), BUNDLE_EXT)
+    logger.info(f"Saved {path} {os.path.getsize(path):,} bytes")
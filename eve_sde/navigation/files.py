@@ -0,0 +1,93 @@
+"""
+    Build versioned data files shared between processes
+"""
+# Standard Library
+import glob
+import logging
+import os
+import struct
+
+# Third Party
+import numpy as np
+
+from .. import app_settings
+
+logger = logging.getLogger(__name__)
+
+# Sections of the binary files are aligned so they can be viewed in place
+ALIGNMENT = 64
+# name, numpy dtype string, number of values, offset from the start of the file
+SECTION = struct.Struct("<16s4sIQ")
+
+
+def data_path(name, build, ext="npy"):
+    return os.path.join(app_settings.ESDE_DATA_DIR, f"{name}-{build}.{ext}")
+
+
+def save_file(name, build, write, ext="npy"):
+    """
+    Atomically write the file for `build` with `write(f)` and drop the
+    files of older builds.
+    """
+    os.makedirs(app_settings.ESDE_DATA_DIR, exist_ok=True)
+    path = data_path(name, build, ext)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+    for old in glob.glob(os.path.join(app_settings.ESDE_DATA_DIR, f"{name}-[0-9]*.{ext}")):
+        if old != path:
+            os.remove(old)
+    return path
+
+
+def save_array(name, build, array):
+    """
+    Atomically write `array` for `build` and drop the files of older builds.
+    """
+    path = save_file(name, build, lambda f: np.save(f, array))
+    logger.info(f"Saved {path} {array.shape} {array.nbytes:,} bytes")
+    return path
+
+
+def load_array(name, build):
+    """
+    Memory map the array for `build`, None if it has not been built.
+    """
+    try:
+        return np.load(data_path(name, build), mmap_mode="r")
+    except FileNotFoundError:
+        return None
+
+
+def write_sections(f, header, sections, entry=SECTION):
+    """
+    Write the `header` bytes, a table with an `entry` per section and the
+    (name, array) `sections` little endian, each aligned to `ALIGNMENT`.
+    """
+    arrays = [np.ascontiguousarray(a, dtype=a.dtype.newbyteorder("<")) for _, a in sections]
+    offset = len(header) + entry.size * len(sections)
+    table = []
+    for (name, _), array in zip(sections, arrays):
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        table.append(entry.pack(name.encode(), array.dtype.str.encode(), array.size, offset))
+        offset += array.nbytes
+    f.write(header)
+    f.write(b"".join(table))
+    for row, array in zip(table, arrays):
+        f.write(b"\0" * (entry.unpack(row)[3] - f.tell()))
+        f.write(array.tobytes())
+
+
+def read_sections(buffer, start, count, entry=SECTION):
+    """
+    {name: array} of the `count` sections in the table at `start`, the
+    arrays are views over `buffer` and are never copied.
+    """
+    arrays = {}
+    for i in range(count):
+        name, dtype, size, offset = entry.unpack_from(buffer, start + i * entry.size)
+        arrays[name.rstrip(b"\0").decode()] = np.frombuffer(
+            buffer, dtype=dtype.rstrip(b"\0").decode(), count=size, offset=offset
+        )
+    return arrays
@@ -0,0 +1,186 @@
+"""
+    Stargate jump graph
+
+    The graph is built once per SDE build from the `Stargate` rows and kept in
+    CSR form, `indptr[i]:indptr[i + 1]` is the slice of `indices` holding the
+    neighbours of the system at `ids[i]`.
+"""
+# Standard Library
+from functools import lru_cache
+
+# Third Party
+import numpy as np
+
+from .. import app_settings
+from ..build import current_build_number, per_build
+
+UNREACHED = -1
+
+
+def expand(indptr, indices, frontier):
+    """
+    Neighbours of every node in `frontier` and the node each came from.
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=indices.dtype), np.empty(0, dtype=frontier.dtype)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return indices[np.arange(total) + offsets], np.repeat(frontier, counts)
+
+
+def bfs(indptr, indices, sources, max_depth=None, target=None):
+    """
+    Breadth first search over a CSR graph, see `GateGraph.bfs`.
+    """
+    dist = np.full(len(indptr) - 1, UNREACHED, dtype=np.int32)
+    parent = np.full(len(indptr) - 1, UNREACHED, dtype=np.int32)
+    frontier = np.unique(np.asarray(sources, dtype=np.int32))
+    dist[frontier] = 0
+    depth = 0
+    while len(frontier) and (max_depth is None or depth < max_depth):
+        if target is not None and dist[target] != UNREACHED:
+            break
+        depth += 1
+        nbrs, came_from = expand(indptr, indices, frontier)
+        new = dist[nbrs] == UNREACHED
+        nbrs, first = np.unique(nbrs[new], return_index=True)
+        dist[nbrs] = depth
+        parent[nbrs] = came_from[new][first]
+        frontier = nbrs
+    return dist, parent
+
+
+def trace(parent, source, destination):
+    """
+    Indexes from `source` to `destination` inclusive following `parent`.
+    """
+    path = [destination]
+    while path[-1] != source:
+        path.append(int(parent[path[-1]]))
+    return path[::-1]
+
+
+def csr(src, dst, n):
+    """
+    CSR `indptr` and `indices` of the edges `src[k] -> dst[k]` over `n` nodes.
+    """
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order]
+
+
+class GateGraph:
+    """
+    Immutable CSR adjacency of the stargate network.
+    """
+
+    def __init__(self, edges):
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.ids = np.unique(edges)
+        self.index = {int(_id): i for i, _id in enumerate(self.ids)}
+        src = np.searchsorted(self.ids, edges[:, 0]).astype(np.int32)
+        dst = np.searchsorted(self.ids, edges[:, 1]).astype(np.int32)
+        self.indptr, self.indices = csr(src, dst, len(self.ids))
+
+    @classmethod
+    def from_db(cls):
+        # AA Example App
+        from eve_sde.models import Stargate
+
+        return cls(
+            list(
+                Stargate.objects.filter(
+                    solar_system__isnull=False,
+                    destination__isnull=False
+                ).values_list("solar_system_id", "destination_id")
+            )
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def neighbours(self, system_id):
+        i = self.index.get(system_id)
+        if i is None:
+            return []
+        return self.ids[self.indices[self.indptr[i]:self.indptr[i + 1]]].tolist()
+
+    def bfs(self, sources, max_depth=None, target=None):
+        """
+        Breadth first search from the graph indexes in `sources`.
+
+        Returns the jump count and parent index arrays, unreached nodes are
+        `UNREACHED`. Stops early once `target` has been reached.
+        """
+        return bfs(self.indptr, self.indices, sources, max_depth, target)
+
+    def route(self, source_id, destination_id):
+        """
+        Shortest list of system ids from source to destination inclusive,
+        or None when there is no gate route.
+        """
+        src = self.index.get(source_id)
+        dst = self.index.get(destination_id)
+        if src is None or dst is None:
+            return None
+        dist, parent = self.bfs([src], target=dst)
+        if dist[dst] == UNREACHED:
+            return None
+        return self.ids[trace(parent, src, dst)].tolist()
+
+    def jumps(self, source_id, destination_id):
+        _route = self.route(source_id, destination_id)
+        return None if _route is None else len(_route) - 1
+
+    def systems_within(self, source_id, max_jumps):
+        """
+        {system_id: jumps} of every system within `max_jumps` gate jumps.
+        """
+        src = self.index.get(source_id)
+        if src is None:
+            return {}
+        dist, _ = self.bfs([src], max_depth=max_jumps)
+        reached = np.flatnonzero(dist != UNREACHED)
+        return dict(zip(self.ids[reached].tolist(), dist[reached].tolist()))
+
+
+@per_build
+def get_gate_graph():
+    return GateGraph.from_db()
+
+
+@lru_cache(maxsize=app_settings.ESDE_ROUTE_CACHE_SIZE)
+def _route(build, source_id, destination_id):
+    _r = get_gate_graph().route(source_id, destination_id)
+    return None if _r is None else tuple(_r)
+
+
+def route(source_id, destination_id):
+    """
+    Shortest gate route between two systems as a list of system ids.
+    """
+    _r = _route(current_build_number(), source_id, destination_id)
+    return None if _r is None else list(_r)
+
+
+def jumps(source_id, destination_id):
+    """
+    Number of gate jumps between two systems, None if not connected.
+    """
+    _r = _route(current_build_number(), source_id, destination_id)
+    return None if _r is None else len(_r) - 1
+
+
+def systems_within(source_id, max_jumps):
+    """
+    {system_id: jumps} for every system within `max_jumps` gate jumps.
+    """
+    return get_gate_graph().systems_within(source_id, max_jumps)
+
+
+def clear_cache():
+    get_gate_graph.cache_clear()
+    _route.cache_clear()
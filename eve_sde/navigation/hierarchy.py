@@ -0,0 +1,192 @@
+"""
+    Hierarchical gate routing
+
+    The gate graph is split into groups (regions by default), systems with a
+    gate to another group are portals. Each group keeps a table of in group
+    jump counts from its portals to its systems and the portals share a
+    table of jump counts between each other, so a route is the best
+    `source -> portal -> ... -> portal -> destination` combination read from
+    the tables. Only the chosen route is then expanded, portal to portal over
+    the abstract graph and with a small in group search for each leg.
+"""
+# Standard Library
+from functools import lru_cache
+
+# Third Party
+import numpy as np
+
+from .. import app_settings
+from ..build import current_build_number, per_build
+from . import gates
+from .jump_matrix import UNREACHABLE, chunked_distance_rows
+
+GROUP_FIELDS = ("region_id", "constellation_id")
+NO_ROUTE = np.iinfo(np.int32).max
+
+
+class _CSR:
+    """
+    Bare CSR graph for `distance_rows`.
+    """
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+
+class HierarchicalGraph:
+    """
+    Portal tables over a `GateGraph`, `groups` holds the group of each
+    system in `graph.ids` order.
+    """
+
+    def __init__(self, graph, groups):
+        self.graph = graph
+        self.groups = np.asarray(groups, dtype=np.int64)
+        n = len(graph)
+        src = np.repeat(np.arange(n, dtype=np.int32), np.diff(graph.indptr))
+        dst = graph.indices
+        same = self.groups[src] == self.groups[dst]
+        # in group edges only, still indexed like the full graph
+        local_indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(src[same], minlength=n), out=local_indptr[1:])
+        self.local = _CSR(local_indptr, dst[same])
+
+        self.portals = np.unique(src[~same]).astype(np.int32)
+        self.portal_index = np.full(n, -1, dtype=np.int32)
+        self.portal_index[self.portals] = np.arange(len(self.portals), dtype=np.int32)
+        # jump counts between every pair of portals
+        self.portal_jumps = chunked_distance_rows(graph, self.portals)[:, self.portals]
+
+        # per group: portal indexes, members and the in group jump counts
+        # (portals x members)
+        local_rows = chunked_distance_rows(self.local, self.portals)
+        self.member_column = np.zeros(n, dtype=np.int32)
+        self.tables = {}
+        for group in np.unique(self.groups).tolist():
+            members = np.flatnonzero(self.groups == group).astype(np.int32)
+            self.member_column[members] = np.arange(len(members), dtype=np.int32)
+            rows = np.flatnonzero(self.groups[self.portals] == group)
+            self.tables[group] = (self.portals[rows], local_rows[np.ix_(rows, members)])
+
+    @classmethod
+    def from_db(cls, graph, field="region_id"):
+        # AA Example App
+        from eve_sde.models import SolarSystem
+
+        if field not in GROUP_FIELDS:
+            raise ValueError(f"Unknown group field {field}")
+        lookup = dict(SolarSystem.objects.values_list("id", field))
+        return cls(graph, [lookup.get(_id) or -1 for _id in graph.ids.tolist()])
+
+    def _portal_legs(self, i):
+        """
+        Portals of the group of graph index `i` and their in group jumps to it.
+        """
+        portals, table = self.tables[int(self.groups[i])]
+        return portals, table[:, self.member_column[i]].astype(np.int32)
+
+    def _local_path(self, src, dst):
+        dist, parent = gates.bfs(self.local.indptr, self.local.indices, [src], target=dst)
+        return gates.trace(parent, src, dst)
+
+    def _portal_path(self, src, dst):
+        """
+        Portal to portal legs, each hop keeps on a shortest route.
+        """
+        path = [src]
+        target = self.portal_index[dst]
+        while path[-1] != dst:
+            cur = path[-1]
+            remaining = int(self.portal_jumps[self.portal_index[cur], target])
+            nbrs = self.graph.indices[self.graph.indptr[cur]:self.graph.indptr[cur + 1]]
+            across = nbrs[self.groups[nbrs] != self.groups[cur]]
+            step = across[self.portal_jumps[self.portal_index[across], target] == remaining - 1]
+            if len(step):
+                path.append(int(step[0]))
+                continue
+            portals, legs = self._portal_legs(cur)
+            cost = legs + self.portal_jumps[self.portal_index[portals], target]
+            cost[legs == UNREACHABLE] = UNREACHABLE
+            step = portals[(cost == remaining) & (portals != cur)][0]
+            path.extend(self._local_path(cur, int(step))[1:])
+        return path
+
+    def route(self, source_id, destination_id):
+        """
+        Shortest list of system ids from source to destination inclusive,
+        or None when there is no gate route.
+        """
+        src = self.graph.index.get(source_id)
+        dst = self.graph.index.get(destination_id)
+        if src is None or dst is None:
+            return None
+        best, via = NO_ROUTE, None
+        if self.groups[src] == self.groups[dst]:
+            dist, parent = gates.bfs(self.local.indptr, self.local.indices, [src], target=dst)
+            if dist[dst] != gates.UNREACHED:
+                best = dist[dst]
+        out_portals, out_legs = self._portal_legs(src)
+        in_portals, in_legs = self._portal_legs(dst)
+        if len(out_portals) and len(in_portals):
+            between = self.portal_jumps[np.ix_(self.portal_index[out_portals], self.portal_index[in_portals])]
+            unreachable = (
+                (out_legs[:, None] == UNREACHABLE)
+                | (between == UNREACHABLE)
+                | (in_legs[None, :] == UNREACHABLE)
+            )
+            total = np.where(
+                unreachable,
+                NO_ROUTE,
+                out_legs[:, None] + between.astype(np.int32) + in_legs[None, :]
+            )
+            i, j = np.unravel_index(np.argmin(total), total.shape)
+            if total[i, j] < best:
+                best, via = total[i, j], (int(out_portals[i]), int(in_portals[j]))
+        if best == NO_ROUTE:
+            return None
+        if via is None:
+            path = gates.trace(parent, src, dst)
+        else:
+            path = (
+                self._local_path(src, via[0])
+                + self._portal_path(*via)[1:]
+                + self._local_path(via[1], dst)[1:]
+            )
+        return self.graph.ids[path].tolist()
+
+    def jumps(self, source_id, destination_id):
+        _route = self.route(source_id, destination_id)
+        return None if _route is None else len(_route) - 1
+
+
+@per_build
+def get_hierarchy():
+    return HierarchicalGraph.from_db(gates.get_gate_graph())
+
+
+@lru_cache(maxsize=app_settings.ESDE_ROUTE_CACHE_SIZE)
+def _route(build, source_id, destination_id):
+    _r = get_hierarchy().route(source_id, destination_id)
+    return None if _r is None else tuple(_r)
+
+
+def route(source_id, destination_id):
+    """
+    Shortest gate route between two systems via the region portals.
+    """
+    _r = _route(current_build_number(), source_id, destination_id)
+    return None if _r is None else list(_r)
+
+
+def jumps(source_id, destination_id):
+    _r = _route(current_build_number(), source_id, destination_id)
+    return None if _r is None else len(_r) - 1
+
+
+def clear_cache():
+    get_hierarchy.cache_clear()
+    _route.cache_clear()
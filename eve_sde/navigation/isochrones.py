@@ -0,0 +1,71 @@
+"""
+    Bulk "systems within N jumps" lookups
+
+    All the sources are searched together with the bitset BFS used for the
+    jump matrix, so each level of the search walks the graph once for every
+    source instead of once per source.
+"""
+# Standard Library
+from functools import lru_cache
+
+# Third Party
+import numpy as np
+
+from ..build import current_build_number
+from .gates import get_gate_graph
+from .jump_matrix import UNREACHABLE, chunked_distance_rows
+
+# (sources, max jumps) results kept in each process
+ISOCHRONE_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=ISOCHRONE_CACHE_SIZE)
+def _jump_rows(build, source_ids, max_jumps):
+    graph = get_gate_graph()
+    sources = np.array([graph.index[_id] for _id in source_ids], dtype=np.int32)
+    rows = chunked_distance_rows(graph, sources, max_jumps)
+    rows.flags.writeable = False
+    return rows
+
+
+def jump_rows(source_ids, max_jumps):
+    """
+    The known sources as a sorted tuple and a read only `uint8` array of
+    their jump counts to every system in `get_gate_graph().ids` order,
+    `UNREACHABLE` beyond `max_jumps`.
+    """
+    index = get_gate_graph().index
+    sources = tuple(sorted({_id for _id in source_ids if _id in index}))
+    return sources, _jump_rows(current_build_number(), sources, int(max_jumps))
+
+
+def systems_within_many(source_ids, max_jumps):
+    """
+    {source_id: {system_id: jumps}} of every system within `max_jumps` gate
+    jumps of each source, unknown sources map to an empty dict.
+    """
+    ids = get_gate_graph().ids
+    sources, rows = jump_rows(source_ids, max_jumps)
+    out = {_id: {} for _id in source_ids}
+    for _id, row in zip(sources, rows):
+        reached = np.flatnonzero(row != UNREACHABLE)
+        out[_id] = dict(zip(ids[reached].tolist(), row[reached].tolist()))
+    return out
+
+
+def systems_within_any(source_ids, max_jumps):
+    """
+    {system_id: jumps} of every system within `max_jumps` of any source,
+    with the jumps to the nearest source.
+    """
+    ids = get_gate_graph().ids
+    _, rows = jump_rows(source_ids, max_jumps)
+    if not len(rows):
+        return {}
+    nearest = rows.min(axis=0)
+    reached = np.flatnonzero(nearest != UNREACHABLE)
+    return dict(zip(ids[reached].tolist(), nearest[reached].tolist()))
+
+
+def clear_cache():
+    _jump_rows.cache_clear()
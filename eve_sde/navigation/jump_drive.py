@@ -0,0 +1,147 @@
+"""
+    Jump drive route planning
+
+    An A* search with a straight line heuristic over the systems a jump
+    drive can enter, the edges of each system are read from the neighbour
+    lists built after each import (`neighbours.systems_within_ly`).
+"""
+# Standard Library
+import heapq
+import math
+from functools import lru_cache
+from typing import NamedTuple
+
+# Third Party
+import numpy as np
+
+from .. import app_settings
+from ..build import current_build_number, per_build
+from .neighbours import systems_within_ly
+from .spatial import get_spatial_index
+from .weighted import HIGH_SEC
+
+MODE_JUMPS = "jumps"
+MODE_DISTANCE = "distance"
+MODES = (MODE_JUMPS, MODE_DISTANCE)
+
+# Only k-space can be jumped to, and not Pochven or Zarzakh
+KSPACE_IDS = (30000000, 31000000)
+NO_JUMP_REGIONS = {10000070}
+NO_JUMP_SYSTEMS = {30100000}
+
+
+class JumpPlan(NamedTuple):
+    systems: tuple
+    legs: tuple
+
+    @property
+    def jumps(self):
+        return len(self.legs)
+
+    @property
+    def distance_ly(self):
+        return sum(self.legs)
+
+
+@per_build
+def get_jump_destinations():
+    """
+    Boolean mask over the spatial index of systems a jump drive can enter.
+    """
+    # AA Example App
+    from eve_sde.models import SolarSystem
+
+    index = get_spatial_index()
+    allowed = np.zeros(len(index), dtype=bool)
+    for _id, sec, region in SolarSystem.objects.values_list("id", "security_status", "region_id"):
+        i = index.index.get(_id)
+        if (
+            i is None
+            or not KSPACE_IDS[0] <= _id < KSPACE_IDS[1]
+            or sec is None
+            or sec >= HIGH_SEC
+            or region in NO_JUMP_REGIONS
+            or _id in NO_JUMP_SYSTEMS
+        ):
+            continue
+        allowed[i] = True
+    return allowed
+
+
+def _search(source, destination, range_ly, mode=MODE_JUMPS, avoid=frozenset()):
+    """
+    A* over system ids. The cost is (jumps, light years) for MODE_JUMPS
+    and (light years, jumps) for MODE_DISTANCE.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown jump mode {mode}, expected one of {MODES}")
+    index = get_spatial_index()
+    allowed = get_jump_destinations()
+    target = index.coords[index.index[destination]]
+
+    def heuristic(node):
+        _ly = float(np.linalg.norm(index.coords[index.index[node]] - target))
+        _jumps = math.ceil(_ly / range_ly - 1e-9)
+        return (_jumps, _ly) if mode == MODE_JUMPS else (_ly, _jumps)
+
+    best = {source: (0, 0.0) if mode == MODE_JUMPS else (0.0, 0)}
+    parent = {source: None}
+    heap = [(heuristic(source), best[source], source)]
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node == destination:
+            break
+        if cost > best[node]:
+            continue
+        for nxt, _ly in systems_within_ly(node, range_ly):
+            i = index.index.get(nxt)
+            if i is None or not allowed[i] or nxt in avoid:
+                continue
+            if mode == MODE_JUMPS:
+                _cost = (cost[0] + 1, cost[1] + _ly)
+            else:
+                _cost = (cost[0] + _ly, cost[1] + 1)
+            if nxt not in best or _cost < best[nxt]:
+                best[nxt] = _cost
+                parent[nxt] = node
+                _h = heuristic(nxt)
+                heapq.heappush(heap, ((_cost[0] + _h[0], _cost[1] + _h[1]), _cost, nxt))
+
+    if destination not in parent:
+        return None
+    path = [destination]
+    while parent[path[-1]] is not None:
+        path.append(parent[path[-1]])
+    path.reverse()
+    legs = tuple(
+        float(np.linalg.norm(index.coords[index.index[a]] - index.coords[index.index[b]]))
+        for a, b in zip(path, path[1:])
+    )
+    return JumpPlan(tuple(path), legs)
+
+
+@lru_cache(maxsize=app_settings.ESDE_ROUTE_CACHE_SIZE)
+def _plan(build, source_id, destination_id, range_ly, mode, avoid):
+    index = get_spatial_index()
+    src = index.index.get(source_id)
+    dst = index.index.get(destination_id)
+    if src is None or dst is None or not get_jump_destinations()[dst]:
+        return None
+    if src == dst:
+        return JumpPlan((source_id,), ())
+    return _search(source_id, destination_id, range_ly, mode, avoid - {destination_id})
+
+
+def plan(source_id, destination_id, range_ly, mode=MODE_JUMPS, avoid=()):
+    """
+    Jump drive route for a ship with `range_ly`, fewest jumps first
+    (MODE_JUMPS) or shortest total distance first (MODE_DISTANCE). High sec
+    and non k-space systems are never used as midpoints or destinations.
+    Returns a `JumpPlan` or None.
+    """
+    return _plan(current_build_number(), source_id, destination_id, float(range_ly), mode, frozenset(avoid))
+
+
+def clear_cache():
+    get_jump_destinations.cache_clear()
+    _plan.cache_clear()
@@ -0,0 +1,203 @@
+"""
+    All pairs gate jump counts
+
+    Built after each import into a `uint8` matrix saved as `.npy` so every
+    process on the host can memory map the same pages.
+"""
+# Standard Library
+import logging
+import multiprocessing
+import time
+
+# Third Party
+import numpy as np
+
+from .. import app_settings
+from ..build import current_build_number, per_build_loaded
+from . import gates
+from .files import load_array, save_array
+
+logger = logging.getLogger(__name__)
+
+UNREACHABLE = 255
+MATRIX_NAME = "jump-matrix"
+IDS_NAME = "jump-matrix-ids"
+# Searches run together in one bitset BFS
+SOURCES_PER_CHUNK = 1024
+
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _bfs_rows(sources):
+    return distance_rows(_worker_graph, sources)
+
+
+def padded_neighbours(graph):
+    """
+    The CSR neighbours as an (n, max degree) array, short rows are padded
+    with `n` which callers point at an all zero row.
+    """
+    n = len(graph)
+    degree = np.diff(graph.indptr)
+    nbrs = np.full((n, max(int(degree.max(initial=0)), 1)), n, dtype=np.int32)
+    rows = np.repeat(np.arange(n), degree)
+    cols = np.arange(len(graph.indices)) - np.repeat(graph.indptr[:-1], degree)
+    nbrs[rows, cols] = graph.indices
+    return nbrs
+
+
+def distance_rows(graph, sources, max_depth=UNREACHABLE - 1):
+    """
+    Jump counts from each of the graph indexes in `sources` to every system.
+
+    All the sources are searched at once on bitsets, each node holds a bit
+    per source whose search front is on it, so one level of every search is
+    an OR of the neighbours' bitsets. The distances are kept as 8 bit planes
+    and only unpacked at the end. Gates are two way so searching the edges
+    backwards gives the same result. Systems further than `max_depth` jumps
+    are `UNREACHABLE`.
+    """
+    n = len(graph)
+    k = len(sources)
+    nbrs = padded_neighbours(graph)
+    words = -(-k // 64)
+
+    def pack(bits):
+        packed = np.zeros((n + 1, words * 8), dtype=np.uint8)
+        packed[:n, :-(-k // 8)] = np.packbits(bits, axis=1)
+        return packed.view(np.uint64)
+
+    def unpack(packed):
+        return np.unpackbits(packed[:n].view(np.uint8), axis=1, count=k)
+
+    start = np.zeros((n, k), dtype=bool)
+    start[sources, np.arange(k)] = True
+    # row n stays zero for the padded neighbours
+    frontier = pack(start)
+    visited = frontier.copy()
+    planes = [np.zeros_like(frontier) for _ in range(8)]
+    level = 0
+    while level < min(max_depth, UNREACHABLE - 1):
+        level += 1
+        reached = frontier[nbrs[:, 0]]
+        for d in range(1, nbrs.shape[1]):
+            reached |= frontier[nbrs[:, d]]
+        frontier[:n] = reached & ~visited[:n]
+        if not frontier.any():
+            break
+        visited |= frontier
+        for bit in range(8):
+            if level >> bit & 1:
+                planes[bit] |= frontier
+
+    dist = np.zeros((n, k), dtype=np.uint8)
+    for bit, plane in enumerate(planes):
+        dist |= unpack(plane) << bit
+    dist[unpack(visited) == 0] = UNREACHABLE
+    return dist.T
+
+
+def chunked_distance_rows(graph, sources, max_depth=UNREACHABLE - 1):
+    """
+    `distance_rows` for any number of sources, `SOURCES_PER_CHUNK` at a time.
+    """
+    if not len(sources):
+        return np.empty((0, len(graph)), dtype=np.uint8)
+    chunks = np.array_split(sources, -(-len(sources) // SOURCES_PER_CHUNK))
+    return np.vstack([distance_rows(graph, c, max_depth) for c in chunks])
+
+
+def compute_jump_matrix(graph, processes=None):
+    """
+    Jump counts between every pair of systems, the sources are split in
+    chunks searched over up to `processes` worker processes.
+    """
+    sources = np.arange(len(graph), dtype=np.int32)
+    chunks = np.array_split(sources, max(-(-len(sources) // SOURCES_PER_CHUNK), 1))
+    processes = min(processes or multiprocessing.cpu_count(), len(chunks))
+    if processes > 1:
+        try:
+            with multiprocessing.get_context("spawn").Pool(
+                processes,
+                initializer=_init_worker,
+                initargs=(graph,)
+            ) as pool:
+                return np.vstack(pool.map(_bfs_rows, chunks))
+        except AssertionError:
+            # daemonic processes (eg some celery pools) can not have children
+            logger.warning("Unable to start worker processes, building the jump matrix in process")
+    return np.vstack([distance_rows(graph, c) for c in chunks])
+
+
+def build_jump_matrix():
+    """
+    Post import step, save the jump matrix for the current build.
+    """
+    # AA Example App
+    from eve_sde.models import EveSDE
+
+    start = time.perf_counter()
+    build = EveSDE.get_solo().build_number
+    graph = gates.GateGraph.from_db()
+    matrix = compute_jump_matrix(graph, app_settings.ESDE_JUMP_MATRIX_PROCESSES)
+    save_array(IDS_NAME, build, graph.ids)
+    save_array(MATRIX_NAME, build, matrix)
+    logger.info(f"Jump matrix for {len(graph)} systems took {time.perf_counter() - start:,.2f}s")
+
+
+class JumpMatrix:
+
+    def __init__(self, ids, matrix):
+        self.ids = ids
+        self.matrix = matrix
+        self.index = {int(_id): i for i, _id in enumerate(ids)}
+
+    def jumps(self, source_id, destination_id):
+        src = self.index.get(source_id)
+        dst = self.index.get(destination_id)
+        if src is None or dst is None:
+            return None
+        _jumps = int(self.matrix[src, dst])
+        return None if _jumps == UNREACHABLE else _jumps
+
+    def jumps_from(self, source_id, destination_ids):
+        """
+        Jump counts from one system to many as an int array, -1 when
+        there is no gate route.
+        """
+        src = self.index.get(source_id)
+        dst = np.array([self.index.get(_id, -1) for _id in destination_ids], dtype=np.int64)
+        out = np.full(len(dst), -1, dtype=np.int16)
+        if src is None:
+            return out
+        known = dst >= 0
+        row = self.matrix[src, dst[known]].astype(np.int16)
+        row[row == UNREACHABLE] = -1
+        out[known] = row
+        return out
+
+
+@per_build_loaded
+def get_jump_matrix():
+    build = current_build_number()
+    ids = load_array(IDS_NAME, build)
+    matrix = load_array(MATRIX_NAME, build)
+    if ids is None or matrix is None:
+        return None
+    return JumpMatrix(ids, matrix)
+
+
+def jumps(source_id, destination_id):
+    """
+    O(1) jump count from the shared matrix, falling back to a graph search
+    if the matrix for this build has not been built yet.
+    """
+    _matrix = get_jump_matrix()
+    if _matrix is None:
+        return gates.jumps(source_id, destination_id)
+    return _matrix.jumps(source_id, destination_id)
@@ -0,0 +1,135 @@
+"""
+    Precomputed light year neighbour lists
+
+    Built after each import for the largest of `ESDE_JUMP_RANGES` and saved
+    as CSR arrays, each row sorted by distance so any smaller range is a
+    prefix of the row. The range they were built for is saved with them.
+"""
+# Standard Library
+import logging
+import time
+
+# Third Party
+import numpy as np
+
+from .. import app_settings
+from ..build import current_build_number, per_build_loaded
+from .files import load_array, save_array
+from .spatial import SpatialIndex, get_spatial_index
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 512
+IDS_NAME = "neighbour-ids"
+INDPTR_NAME = "neighbour-indptr"
+INDICES_NAME = "neighbour-indices"
+DISTANCES_NAME = "neighbour-distances"
+RADIUS_NAME = "neighbour-radius"
+
+
+def compute_neighbours(index, max_ly):
+    """
+    CSR neighbour lists within `max_ly`, distances for `BLOCK_SIZE` sources
+    at a time are calculated as one matrix product.
+    """
+    coords = index.coords
+    norms = (coords ** 2).sum(axis=1)
+    counts = np.zeros(len(index), dtype=np.int64)
+    indices = []
+    distances = []
+    for start in range(0, len(index), BLOCK_SIZE):
+        block = coords[start:start + BLOCK_SIZE]
+        sq = norms[start:start + BLOCK_SIZE, None] + norms[None, :] - 2 * block @ coords.T
+        rows, cols = np.nonzero(sq <= max_ly ** 2)
+        keep = cols != rows + start
+        rows, cols = rows[keep], cols[keep]
+        dist = np.sqrt(np.maximum(sq[rows, cols], 0))
+        order = np.lexsort((dist, rows))
+        rows, cols, dist = rows[order], cols[order], dist[order]
+        counts[start:start + BLOCK_SIZE] = np.bincount(rows, minlength=len(block))
+        indices.append(cols.astype(np.int32))
+        distances.append(dist.astype(np.float32))
+    indptr = np.zeros(len(index) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return (
+        indptr,
+        np.concatenate(indices) if indices else np.empty(0, dtype=np.int32),
+        np.concatenate(distances) if distances else np.empty(0, dtype=np.float32),
+    )
+
+
+def build_neighbour_lists():
+    """
+    Post import step, save the neighbour lists for the current build.
+    """
+    # AA Example App
+    from eve_sde.models import EveSDE
+
+    start = time.perf_counter()
+    build = EveSDE.get_solo().build_number
+    index = SpatialIndex.from_db()
+    max_ly = max(app_settings.ESDE_JUMP_RANGES)
+    indptr, indices, distances = compute_neighbours(index, max_ly)
+    save_array(IDS_NAME, build, index.ids)
+    save_array(INDPTR_NAME, build, indptr)
+    save_array(INDICES_NAME, build, indices)
+    save_array(DISTANCES_NAME, build, distances)
+    save_array(RADIUS_NAME, build, np.array([max_ly], dtype=np.float64))
+    logger.info(
+        f"Neighbour lists for {len(index)} systems within {max_ly}LY "
+        f"took {time.perf_counter() - start:,.2f}s"
+    )
+
+
+class NeighbourLists:
+
+    def __init__(self, ids, indptr, indices, distances, max_ly):
+        self.ids = ids
+        self.indptr = indptr
+        self.indices = indices
+        self.distances = distances
+        self.max_ly = max_ly
+        self.index = {int(_id): i for i, _id in enumerate(ids)}
+
+    def within(self, system_id, ly):
+        """
+        [(system_id, light years), ...] within `ly`, nearest first. Raises
+        ValueError when `ly` is beyond the range the lists were built for.
+        """
+        if ly > self.max_ly:
+            raise ValueError(f"Neighbour lists are built for {self.max_ly}LY, not {ly}LY")
+        i = self.index.get(system_id)
+        if i is None:
+            return []
+        start, end = int(self.indptr[i]), int(self.indptr[i + 1])
+        end = start + int(np.searchsorted(self.distances[start:end], ly, side="right"))
+        return list(
+            zip(
+                self.ids[self.indices[start:end]].tolist(),
+                self.distances[start:end].astype(float).tolist()
+            )
+        )
+
+
+@per_build_loaded
+def get_neighbour_lists():
+    build = current_build_number()
+    arrays = [
+        load_array(name, build) for name in (IDS_NAME, INDPTR_NAME, INDICES_NAME, DISTANCES_NAME, RADIUS_NAME)
+    ]
+    if any(a is None for a in arrays):
+        return None
+    *arrays, radius = arrays
+    return NeighbourLists(*arrays, float(radius[0]))
+
+
+def systems_within_ly(system_id, ly):
+    """
+    [(system_id, light years), ...] within `ly`, nearest first. Read from the
+    neighbour lists when built and `ly` is covered, otherwise from the
+    spatial index.
+    """
+    lists = get_neighbour_lists()
+    if lists is not None and ly <= lists.max_ly:
+        return lists.within(system_id, ly)
+    return get_spatial_index().systems_in_range(system_id, ly)
@@ -0,0 +1,172 @@
+"""
+    Dynamic connections over the gate graph
+
+    Jump bridges, Thera/Turnur wormholes etc are kept as named layers in the
+    Django cache so every process sees the same connections. The cached SDE
+    graph is never touched, a graph with the layers added is built next to it
+    and routes over it are cached under the layer versions, so replacing a
+    layer (or one of its connections expiring) only drops the routes that
+    used that layer.
+"""
+# Standard Library
+import time
+from datetime import datetime
+from functools import lru_cache
+
+# Third Party
+import numpy as np
+
+# Django
+from django.core.cache import cache
+
+from .. import app_settings
+from ..build import current_build_number
+from . import gates
+
+LAYER_KEY = "esde-overlay-{}"
+# Overlaid graphs kept in each process, one per combination of layer versions
+OVERLAY_GRAPH_CACHE_SIZE = 8
+
+
+def _timestamp(expires):
+    if isinstance(expires, datetime):
+        return expires.timestamp()
+    return expires
+
+
+def set_layer(name, connections):
+    """
+    Replace the connections of layer `name`.
+
+    `connections` are `(system_id, system_id)` or `(system_id, system_id,
+    expires)` tuples, `expires` a datetime or unix timestamp after which the
+    connection is ignored. Connections are two way and may use systems
+    without stargates, eg Thera.
+    """
+    _connections = []
+    for connection in connections:
+        a, b, *expires = connection
+        _connections.append((int(a), int(b), _timestamp(expires[0]) if expires else None))
+    # soonest to expire first, so the live connections are always a suffix
+    _connections.sort(key=lambda c: (c[2] is None, c[2] or 0))
+    timeout = None
+    if _connections and _connections[-1][2] is not None:
+        timeout = max(int(_connections[-1][2] - time.time()) + 1, 1)
+    cache.set(LAYER_KEY.format(name), (time.time_ns(), tuple(_connections)), timeout)
+
+
+def delete_layer(name):
+    cache.delete(LAYER_KEY.format(name))
+
+
+def get_layer(name):
+    """
+    [(system_id, system_id), ...] of the live connections in layer `name`.
+    """
+    return list(get_overlay([name]).edges)
+
+
+class Overlay:
+    """
+    The live connections of a set of layers. Hashes and compares on `key`,
+    the layer versions and how many of their connections are still live.
+    """
+
+    def __init__(self, key, edges):
+        self.key = key
+        self.edges = edges
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, Overlay) and self.key == other.key
+
+    def __bool__(self):
+        return bool(self.edges)
+
+
+def get_overlay(layers):
+    now = time.time()
+    names = sorted(set(layers))
+    stored = cache.get_many([LAYER_KEY.format(name) for name in names])
+    key = []
+    edges = []
+    for name in names:
+        _layer = stored.get(LAYER_KEY.format(name))
+        if _layer is None:
+            continue
+        version, connections = _layer
+        live = [(a, b) for a, b, expires in connections if expires is None or expires > now]
+        key.append((name, version, len(live)))
+        edges.extend(live)
+    return Overlay(tuple(key), tuple(edges))
+
+
+class OverlayGraph(gates.GateGraph):
+    """
+    A `GateGraph` plus the two way `edges`, systems only in `edges` are
+    indexed after the systems of `graph`.
+    """
+
+    def __init__(self, graph, edges):
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        new = np.setdiff1d(np.unique(edges), graph.ids)
+        self.ids = np.concatenate([graph.ids, new])
+        self.index = dict(graph.index)
+        self.index.update({int(_id): len(graph) + i for i, _id in enumerate(new)})
+        a = np.array([self.index[_id] for _id in edges[:, 0].tolist()], dtype=np.int32)
+        b = np.array([self.index[_id] for _id in edges[:, 1].tolist()], dtype=np.int32)
+        src = np.concatenate([np.repeat(np.arange(len(graph), dtype=np.int32), np.diff(graph.indptr)), a, b])
+        dst = np.concatenate([graph.indices, b, a])
+        self.indptr, self.indices = gates.csr(src, dst, len(self.ids))
+
+
+@lru_cache(maxsize=OVERLAY_GRAPH_CACHE_SIZE)
+def _overlay_graph(build, overlay):
+    return OverlayGraph(gates.get_gate_graph(), overlay.edges)
+
+
+def get_overlay_graph(layers):
+    """
+    The gate graph with the live connections of `layers`.
+    """
+    overlay = get_overlay(layers)
+    if not overlay:
+        return gates.get_gate_graph()
+    return _overlay_graph(current_build_number(), overlay)
+
+
+@lru_cache(maxsize=app_settings.ESDE_ROUTE_CACHE_SIZE)
+def _route(build, overlay, source_id, destination_id):
+    _r = _overlay_graph(build, overlay).route(source_id, destination_id)
+    return None if _r is None else tuple(_r)
+
+
+def route(source_id, destination_id, layers=()):
+    """
+    Shortest route between two systems using the stargates and the live
+    connections of `layers`.
+    """
+    overlay = get_overlay(layers)
+    if not overlay:
+        return gates.route(source_id, destination_id)
+    _r = _route(current_build_number(), overlay, source_id, destination_id)
+    return None if _r is None else list(_r)
+
+
+def jumps(source_id, destination_id, layers=()):
+    _r = route(source_id, destination_id, layers)
+    return None if _r is None else len(_r) - 1
+
+
+def systems_within(source_id, max_jumps, layers=()):
+    """
+    {system_id: jumps} for every system within `max_jumps` jumps.
+    """
+    return get_overlay_graph(layers).systems_within(source_id, max_jumps)
+
+
+def clear_cache():
+    _overlay_graph.cache_clear()
+    _route.cache_clear()
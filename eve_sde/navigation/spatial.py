@@ -0,0 +1,151 @@
+"""
+    Spatial index over the solar system positions
+
+    SDE positions are in metres, everything here works in light years. The
+    index is a uniform grid of `CELL_LY` cells, a range query only measures
+    the systems in the cells overlapping the query sphere.
+"""
+# Standard Library
+from collections import defaultdict
+
+# Third Party
+import numpy as np
+
+from ..build import per_build
+
+METRES_PER_LY = 9_460_730_472_580_800
+CELL_LY = 5.0
+
+
+class SpatialIndex:
+
+    def __init__(self, ids, positions):
+        """
+        `positions` are (x, y, z) in metres.
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.coords = np.asarray(positions, dtype=np.float64).reshape(-1, 3) / METRES_PER_LY
+        self.index = {int(_id): i for i, _id in enumerate(self.ids)}
+        cells = defaultdict(list)
+        for i, cell in enumerate(np.floor(self.coords / CELL_LY).astype(np.int64).tolist()):
+            cells[tuple(cell)].append(i)
+        self.cells = {cell: np.array(members, dtype=np.int32) for cell, members in cells.items()}
+        self.cell_keys = np.array(list(self.cells), dtype=np.int64).reshape(-1, 3)
+        # a sphere this size around any system holds every system
+        self.extent = float(np.linalg.norm(np.ptp(self.coords, axis=0))) + CELL_LY if len(self.ids) else CELL_LY
+
+    @classmethod
+    def from_db(cls):
+        # AA Example App
+        from eve_sde.models import SolarSystem
+
+        rows = list(
+            SolarSystem.objects.filter(
+                x__isnull=False,
+                y__isnull=False,
+                z__isnull=False
+            ).values_list("id", "x", "y", "z")
+        )
+        return cls([r[0] for r in rows], [r[1:] for r in rows])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _candidates(self, point, ly):
+        low = np.floor((point - ly) / CELL_LY).astype(np.int64)
+        high = np.floor((point + ly) / CELL_LY).astype(np.int64)
+        if np.prod(high - low + 1) > len(self.cells):
+            # a large sphere, check the occupied cells instead of every cell in it
+            inside = ((self.cell_keys >= low) & (self.cell_keys <= high)).all(axis=1)
+            found = [self.cells[tuple(key)] for key in self.cell_keys[inside].tolist()]
+        else:
+            found = [
+                self.cells[(x, y, z)]
+                for x in range(low[0], high[0] + 1)
+                for y in range(low[1], high[1] + 1)
+                for z in range(low[2], high[2] + 1)
+                if (x, y, z) in self.cells
+            ]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int32)
+
+    def indexes_in_range(self, point, ly):
+        """
+        Indexes and distances of every system within `ly` of `point`,
+        nearest first.
+        """
+        candidates = self._candidates(point, ly)
+        dist = np.linalg.norm(self.coords[candidates] - point, axis=1)
+        keep = dist <= ly
+        candidates, dist = candidates[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return candidates[order], dist[order]
+
+    def distance(self, source_id, destination_id):
+        """
+        Distance in light years, None if either system has no position.
+        """
+        a = self.index.get(source_id)
+        b = self.index.get(destination_id)
+        if a is None or b is None:
+            return None
+        return float(np.linalg.norm(self.coords[a] - self.coords[b]))
+
+    def systems_in_range(self, system_id, ly):
+        """
+        [(system_id, light years), ...] within `ly` of the system, nearest
+        first and excluding the system itself.
+        """
+        i = self.index.get(system_id)
+        if i is None:
+            return []
+        idx, dist = self.indexes_in_range(self.coords[i], ly)
+        keep = idx != i
+        return list(zip(self.ids[idx[keep]].tolist(), dist[keep].tolist()))
+
+    def nearest(self, system_id, count):
+        """
+        The `count` nearest [(system_id, light years), ...] to the system.
+        """
+        i = self.index.get(system_id)
+        if i is None or count < 1:
+            return []
+        count = min(count, len(self) - 1)
+        ly = CELL_LY
+        while True:
+            idx, dist = self.indexes_in_range(self.coords[i], ly)
+            # everything outside the sphere is further away than anything in it
+            if len(idx) > count or len(idx) == len(self):
+                keep = idx != i
+                return list(zip(self.ids[idx[keep]].tolist(), dist[keep].tolist()))[:count]
+            ly = min(ly * 2, self.extent)
+
+    def systems_in_range_many(self, system_ids, ly):
+        return {_id: self.systems_in_range(_id, ly) for _id in system_ids}
+
+    def nearest_many(self, system_ids, count):
+        return {_id: self.nearest(_id, count) for _id in system_ids}
+
+
+@per_build
+def get_spatial_index():
+    return SpatialIndex.from_db()
+
+
+def distance_ly(source_id, destination_id):
+    return get_spatial_index().distance(source_id, destination_id)
+
+
+def systems_in_range(system_id, ly):
+    return get_spatial_index().systems_in_range(system_id, ly)
+
+
+def nearest(system_id, count):
+    return get_spatial_index().nearest(system_id, count)
+
+
+def systems_in_range_many(system_ids, ly):
+    return get_spatial_index().systems_in_range_many(system_ids, ly)
+
+
+def nearest_many(system_ids, count):
+    return get_spatial_index().nearest_many(system_ids, count)
@@ -0,0 +1,162 @@
+"""
+    Security weighted gate routing
+
+    Matches the in game route preferences, `shortest`, `secure` (prefer high
+    sec) and `insecure` (prefer low/null sec). Entering a system outside the
+    preferred security band costs `AVOID_PENALTY` jumps, which is larger than
+    any real route, so routes minimise the systems outside the band first and
+    the jump count second.
+"""
+# Standard Library
+import heapq
+from functools import lru_cache
+
+# Third Party
+import numpy as np
+
+from .. import app_settings
+from ..build import current_build_number, per_build
+from .gates import get_gate_graph
+
+ROUTE_SHORTEST = "shortest"
+ROUTE_SECURE = "secure"
+ROUTE_INSECURE = "insecure"
+ROUTE_FLAGS = (ROUTE_SHORTEST, ROUTE_SECURE, ROUTE_INSECURE)
+
+# Security status that displays as 0.5 in game
+HIGH_SEC = 0.45
+AVOID_PENALTY = 10000
+
+
+class WeightedGateGraph:
+    """
+    Per route flag edge weights over the CSR gate graph.
+
+    The weight of an edge is the cost of entering its destination system.
+    """
+
+    def __init__(self, graph, security):
+        self.graph = graph
+        self.security = np.array(
+            [security.get(int(_id), np.nan) for _id in graph.ids],
+            dtype=np.float32
+        )
+        high = self.security >= HIGH_SEC
+        node_cost = {
+            ROUTE_SHORTEST: np.ones(len(graph), dtype=np.int32),
+            ROUTE_SECURE: np.where(high, 1, AVOID_PENALTY).astype(np.int32),
+            ROUTE_INSECURE: np.where(high, AVOID_PENALTY, 1).astype(np.int32),
+        }
+        # python lists are much faster than numpy for the scalar heap loop
+        self._indptr = graph.indptr.tolist()
+        self._indices = graph.indices.tolist()
+        self._weights = {
+            flag: cost[graph.indices].tolist() for flag, cost in node_cost.items()
+        }
+
+    @classmethod
+    def from_db(cls):
+        # AA Example App
+        from eve_sde.models import SolarSystem
+
+        return cls(
+            get_gate_graph(),
+            dict(SolarSystem.objects.values_list("id", "security_status"))
+        )
+
+    def dijkstra(self, source, flag=ROUTE_SHORTEST, avoid=frozenset(), targets=None):
+        """
+        Cheapest paths from the graph index `source`, stopping once every
+        index in `targets` is settled. Avoided targets are reached but never
+        passed through. Returns the cost and parent dicts.
+        """
+        if flag not in self._weights:
+            raise ValueError(f"Unknown route flag {flag}, expected one of {ROUTE_FLAGS}")
+        indptr, indices, weights = self._indptr, self._indices, self._weights[flag]
+        cost = {source: 0}
+        parent = {source: None}
+        targets = set(targets) if targets is not None else None
+        remaining = set(targets) if targets is not None else None
+        heap = [(0, source)]
+        while heap:
+            _cost, node = heapq.heappop(heap)
+            if _cost > cost[node]:
+                continue
+            if remaining is not None:
+                remaining.discard(node)
+                if not remaining:
+                    break
+            if node in avoid:
+                continue
+            for k in range(indptr[node], indptr[node + 1]):
+                nxt = indices[k]
+                if nxt in avoid and (targets is None or nxt not in targets):
+                    continue
+                _next_cost = _cost + weights[k]
+                if _next_cost < cost.get(nxt, _next_cost + 1):
+                    cost[nxt] = _next_cost
+                    parent[nxt] = node
+                    heapq.heappush(heap, (_next_cost, nxt))
+        return cost, parent
+
+    def _indexes(self, system_ids):
+        return {self.graph.index[_id] for _id in system_ids if _id in self.graph.index}
+
+    def routes_from(self, source_id, destination_ids, flag=ROUTE_SHORTEST, avoid=()):
+        """
+        {destination_id: route or None} from one source, using one search
+        for all of the destinations.
+        """
+        src = self.graph.index.get(source_id)
+        targets = self._indexes(destination_ids)
+        out = {_id: None for _id in destination_ids}
+        if src is None or not targets:
+            return out
+        # each route may end in an avoided destination, never pass one
+        _avoid = self._indexes(avoid) - {src}
+        _, parent = self.dijkstra(src, flag, _avoid, targets)
+        for _id in destination_ids:
+            node = self.graph.index.get(_id)
+            if node not in parent:
+                continue
+            path = []
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            out[_id] = self.graph.ids[path[::-1]].tolist()
+        return out
+
+    def route(self, source_id, destination_id, flag=ROUTE_SHORTEST, avoid=()):
+        return self.routes_from(source_id, [destination_id], flag, avoid)[destination_id]
+
+
+@per_build
+def get_weighted_graph():
+    return WeightedGateGraph.from_db()
+
+
+@lru_cache(maxsize=app_settings.ESDE_ROUTE_CACHE_SIZE)
+def _route(build, source_id, destination_id, flag, avoid):
+    _r = get_weighted_graph().route(source_id, destination_id, flag, avoid)
+    return None if _r is None else tuple(_r)
+
+
+def route(source_id, destination_id, flag=ROUTE_SHORTEST, avoid=()):
+    """
+    Gate route between two systems using the in game route preference
+    `flag`, never passing through any system id in `avoid`.
+    """
+    _r = _route(current_build_number(), source_id, destination_id, flag, frozenset(avoid))
+    return None if _r is None else list(_r)
+
+
+def routes_from(source_id, destination_ids, flag=ROUTE_SHORTEST, avoid=()):
+    """
+    {destination_id: route or None} for many candidate destinations.
+    """
+    return get_weighted_graph().routes_from(source_id, list(destination_ids), flag, avoid)
+
+
+def clear_cache():
+    get_weighted_graph.cache_clear()
+    _route.cache_clear()
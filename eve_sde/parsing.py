@@ -0,0 +1,122 @@
+"""
+    Pasted item list parsing
+
+    Handles inventory and contract copies (tab separated), EFT fits and
+    free text lines like `Tritanium 1000`, `10x Tritanium` or `Warrior I x5`
+    in any client language. Names are resolved from one dictionary of every
+    translated type name built once per build, never per line.
+"""
+# Standard Library
+import re
+from typing import NamedTuple
+
+from .build import per_build
+from .models.utils import get_langs_for_field
+from .search import normalize
+
+QUANTITY = r"\d(?:[\d,.'\s]*\d)?"
+# `Warrior I x5`, `10x Tritanium`, `10 Tritanium`, `Tritanium 10`
+PATTERNS = (
+    re.compile(rf"^(?P<name>.+?)\s+x\s*(?P<qty>{QUANTITY})$", re.IGNORECASE),
+    re.compile(rf"^(?P<qty>{QUANTITY})\s*x\s+(?P<name>.+)$", re.IGNORECASE),
+    re.compile(rf"^(?P<qty>{QUANTITY})\s+(?P<name>.+)$"),
+    re.compile(rf"^(?P<name>.+?)\s+(?P<qty>{QUANTITY})$"),
+)
+EFT_HEADER = re.compile(r"^\[(?P<name>[^,\]]+)(,[^\]]*)?\]$")
+EFT_OFFLINE = "/offline"
+
+
+class ParsedList(NamedTuple):
+    items: list
+    unknown: list
+
+
+@per_build
+def get_type_names():
+    """
+    {normalized name: type id} over every language. When a name is used
+    twice published types win, then English names.
+    """
+    # AA Example App
+    from eve_sde.models import ItemType
+
+    # "name" would read the active language, the English column is name_en
+    translated = [f for f in get_langs_for_field("name") if f != "name_en"]
+    rows = list(ItemType.objects.values_list("id", "published", "name_en", *translated))
+    names = {}
+    # later writes win, so unpublished types then translations go first
+    for published in (False, True):
+        for _id, _published, _, *translated in rows:
+            if bool(_published) == published:
+                for _name in translated:
+                    if _name:
+                        names[normalize(_name)] = _id
+        for _id, _published, name, *_ in rows:
+            if bool(_published) == published and name:
+                names[normalize(name)] = _id
+    return names
+
+
+def parse_quantity(text):
+    digits = re.sub(r"[,.'\s]", "", text or "")
+    return int(digits) if digits.isdigit() else 1
+
+
+def _resolve(names, line):
+    """
+    (type id, quantity) for one line, or None.
+    """
+    if "\t" in line:
+        name, *columns = line.split("\t")
+        _id = names.get(normalize(name))
+        if _id is None:
+            return None
+        qty = next((c for c in columns if re.fullmatch(QUANTITY, c.strip())), None)
+        return _id, parse_quantity(qty)
+
+    header = EFT_HEADER.match(line)
+    if header:
+        _id = names.get(normalize(header["name"]))
+        return None if _id is None else (_id, 1)
+
+    if line.lower().endswith(EFT_OFFLINE):
+        line = line[:-len(EFT_OFFLINE)].strip()
+    _id = names.get(normalize(line))
+    if _id is not None:
+        return _id, 1
+    for pattern in PATTERNS:
+        match = pattern.match(line)
+        if match:
+            _id = names.get(normalize(match["name"]))
+            if _id is not None:
+                return _id, parse_quantity(match["qty"])
+    if ", " in line:
+        # EFT module with a loaded charge, only the module is counted
+        return _resolve(names, line.split(", ")[0])
+    return None
+
+
+def parse_items(text):
+    """
+    `ParsedList` of the pasted `text`, `items` are (type id, quantity)
+    tuples summed per type in first seen order and `unknown` the lines that
+    could not be resolved.
+    """
+    names = get_type_names()
+    totals = {}
+    unknown = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.lower().startswith("[empty "):
+            continue
+        resolved = _resolve(names, line)
+        if resolved is None:
+            unknown.append(line)
+            continue
+        _id, qty = resolved
+        totals[_id] = totals.get(_id, 0) + qty
+    return ParsedList(list(totals.items()), unknown)
+
+
+def clear_cache():
+    get_type_names.cache_clear()
@@ -0,0 +1,138 @@
+"""
+    Lightweight read only records for hot path SDE reads
+
+    Named tuples of the snapshot columns, a fraction of the size of a model
+    instance with its dozens of translation columns. Read them by id from
+    the memory mapped snapshot, or from any queryset with `values_list`.
+"""
+# Standard Library
+from typing import NamedTuple, Optional
+
+# Third Party
+import numpy as np
+
+from .names import language_field
+from .snapshot import TABLES, get_snapshot, models_by_table
+
+
+class CategoryRecord(NamedTuple):
+    id: int
+    name: str
+    published: bool
+
+
+class GroupRecord(NamedTuple):
+    id: int
+    name: str
+    category_id: Optional[int]
+    published: bool
+
+    def category(self, lang="en"):
+        return get_record("categories", self.category_id, lang)
+
+
+class TypeRecord(NamedTuple):
+    id: int
+    name: str
+    group_id: Optional[int]
+    category_id: Optional[int]
+    volume: Optional[float]
+    published: bool
+
+    def group(self, lang="en"):
+        return get_record("groups", self.group_id, lang)
+
+    def category(self, lang="en"):
+        return get_record("categories", self.category_id, lang)
+
+
+class RegionRecord(NamedTuple):
+    id: int
+    name: str
+
+
+class ConstellationRecord(NamedTuple):
+    id: int
+    name: str
+    region_id: Optional[int]
+
+    def region(self, lang="en"):
+        return get_record("regions", self.region_id, lang)
+
+
+class SystemRecord(NamedTuple):
+    id: int
+    name: str
+    constellation_id: Optional[int]
+    region_id: Optional[int]
+    security_status: Optional[float]
+    x: Optional[float]
+    y: Optional[float]
+    z: Optional[float]
+
+    def constellation(self, lang="en"):
+        return get_record("constellations", self.constellation_id, lang)
+
+    def region(self, lang="en"):
+        return get_record("regions", self.region_id, lang)
+
+
+# The record of each snapshot table, fields are id, name then its columns
+RECORDS = {
+    "types": TypeRecord,
+    "groups": GroupRecord,
+    "categories": CategoryRecord,
+    "systems": SystemRecord,
+    "constellations": ConstellationRecord,
+    "regions": RegionRecord,
+}
+
+
+def _table(table):
+    if table not in RECORDS:
+        raise ValueError(f"Unknown table {table}, expected one of {list(RECORDS)}")
+    return table
+
+
+def get_records(table, ids=None, lang="en"):
+    """
+    {id: record} from the snapshot for the `ids` found in `table`, every
+    row when `ids` is None. Names are in `lang`, English when not
+    translated.
+    """
+    snapshot_table = get_snapshot().tables[_table(table)]
+    if ids is None:
+        rows = np.arange(len(snapshot_table))
+    else:
+        rows = snapshot_table.rows(list(ids))
+        rows = rows[rows >= 0]
+    columns = [snapshot_table.values(column, rows) for column, _, _ in TABLES[table]]
+    ids = snapshot_table.ids[rows].tolist()
+    return dict(zip(ids, map(RECORDS[table]._make, zip(ids, snapshot_table.names_of(rows, lang), *columns))))
+
+
+def get_record(table, _id, lang="en"):
+    """
+    The record of `_id` in `table`, None if unknown.
+    """
+    if _id is None:
+        return None
+    return get_records(table, [_id], lang).get(_id)
+
+
+def from_queryset(queryset, lang="en"):
+    """
+    Records of the rows of `queryset`, any queryset of a model with a
+    snapshot table, read with `values_list` instead of model instances.
+    """
+    table = next((t for t, model in models_by_table().items() if model is queryset.model), None)
+    if table is None:
+        raise ValueError(f"No records for {queryset.model.__name__}")
+    record = RECORDS[table]
+    fields = [f for _, f, _ in TABLES[table]]
+    # values_list drops repeated columns, the field is name_en in English
+    names = list(dict.fromkeys([language_field(lang), "name_en"]))
+    return [
+        record(_id, row[0] or row[len(names) - 1], *row[len(names):])
+        for _id, *row in queryset.values_list("id", *names, *fields).iterator()
+    ]
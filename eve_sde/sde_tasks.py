@@ -4,15 +4,24 @@ import json
 import logging
 import os
 import shutil
+import subprocess
+import sys
+import threading
 import zipfile
 from datetime import datetime, timezone
 
 # Third Party
 import httpx
 
+# Django
+from django.conf import settings
+
 # AA Example App
-from eve_sde.models import EveSDE
+from eve_sde.models import EveSDE, EveSDESection
 
+from . import app_settings
+from .build import reset_build_number
+from .db import analyze_table, import_transaction
 from .models.map import Constellation, Moon, Planet, Region, SolarSystem, Stargate
 from .models.types import (
     DogmaAttribute,
@@ -24,6 +33,11 @@ from .models.types import (
     ItemTypeMaterials,
     TypeDogma,
 )
+from .navigation.bundle import build_universe_bundle
+from .navigation.jump_matrix import build_jump_matrix
+from .navigation.neighbours import build_neighbour_lists
+from .search import build_search_indexes
+from .snapshot import build_sde_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -51,9 +65,20 @@ SDE_PARTS_TO_UPDATE = [
     # InvTypeMaterials,
 ]
 
+# Steps run once all the sections are loaded and the build is set
+SDE_POST_IMPORT_STEPS = [
+    build_jump_matrix,
+    build_neighbour_lists,
+    build_universe_bundle,
+    build_search_indexes,
+    build_sde_snapshot,
+]
+
 SDE_URL = "https://developers.eveonline.com/static-data/eve-online-static-data-latest-jsonl.zip"
 SDE_FILE_NAME = "eve-online-static-data-latest-jsonl.zip"
 SDE_FOLDER = "eve-sde"
+# Prefix of the line a section subprocess uses to hand its stats back
+SECTION_STATS_PREFIX = "ESDE_SECTION_STATS:"
 
 
 def download_file(url, local_filename):
@@ -119,7 +144,80 @@ def process_section_of_sde(id: int = 0):
     """
         Update a SDE model.
     """
-    SDE_PARTS_TO_UPDATE[id].load_from_sde(SDE_FOLDER)
+    mdl = SDE_PARTS_TO_UPDATE[id]
+    with import_transaction():
+        stats = mdl.load_from_sde(SDE_FOLDER)
+
+    stats["maintenance_seconds"] = analyze_table(mdl)
+    if stats["maintenance_seconds"] is not None:
+        EveSDESection.objects.filter(
+            sde_section=mdl.__name__
+        ).update(
+            maintenance_seconds=stats["maintenance_seconds"]
+        )
+    return stats
+
+
+def process_section_of_sde_isolated(id: int = 0):
+    """
+        Update a SDE model in a short lived child process.
+
+        The child runs the `esde_load_sde_section` command against the already
+        extracted SDE, its log output is relayed to our logger and the stats
+        are passed back on the last line of its output. It is killed after
+        `ESDE_SECTION_SUBPROCESS_TIMEOUT` seconds.
+    """
+    env = os.environ.copy()
+    env["DJANGO_SETTINGS_MODULE"] = settings.SETTINGS_MODULE
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    cmd = [
+        sys.executable, "-m", "django",
+        "esde_load_sde_section", str(id),
+        "--skip-download", "--json",
+    ]
+
+    stats = {}
+
+    def relay(stdout):
+        for line in stdout:
+            line = line.rstrip()
+            if line.startswith(SECTION_STATS_PREFIX):
+                stats.update(json.loads(line[len(SECTION_STATS_PREFIX):]))
+            elif line:
+                logger.info(f"[section {id}] {line}")
+
+    timeout = app_settings.ESDE_SECTION_SUBPROCESS_TIMEOUT
+    failure = None
+    with subprocess.Popen(
+        cmd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    ) as proc:
+        # read the output in a thread so a hung child can be timed out
+        reader = threading.Thread(target=relay, args=(proc.stdout,), daemon=True)
+        reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            failure = f"timed out after {timeout:,}s"
+        reader.join()
+
+    if failure is None and proc.returncode != 0:
+        failure = f"failed with exit code {proc.returncode}"
+    if failure is not None:
+        raise RuntimeError(
+            f"SDE section {id} ({SDE_PARTS_TO_UPDATE[id].__name__}) {failure}"
+        )
+
+    logger.info(
+        f"{stats.get('section')} - {stats.get('total_rows')}/{stats.get('total_lines')} "
+        f"in {stats.get('seconds', 0):,.2f}s - child peak RSS {stats.get('max_rss_kb', 0):,}kB"
+    )
+    return stats
 
 
 def process_from_sde(start_from: int = 0):
@@ -140,6 +238,18 @@ def process_from_sde(start_from: int = 0):
     set_sde_version()
     delete_sde_folder()
 
+    for id in range(len(SDE_POST_IMPORT_STEPS)):
+        process_post_import_step(id)
+
+
+def process_post_import_step(id: int = 0):
+    """
+        Run a post import step.
+    """
+    step = SDE_POST_IMPORT_STEPS[id]
+    logger.info(f"Starting post import step {step.__name__}")
+    step()
+
 
 def set_sde_version():
     """
@@ -157,4 +267,5 @@ def set_sde_version():
     _o.build_number = build
     _o.release_date = release
     _o.save()
+    reset_build_number()
     logger.info(f"SDE Updated to Build:{build} from:{release}")
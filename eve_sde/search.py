@@ -0,0 +1,296 @@
+"""
+    Multilingual name search for types and map objects
+
+    One index per language is built after each import and saved to
+    `ESDE_DATA_DIR`. Names are case folded and kept sorted, so a prefix is a
+    binary search, and each name's trigrams (padded like pg_trgm) are kept
+    as postings lists for fuzzy matches. Prefix matches rank first, shortest
+    name first, then fuzzy matches by trigram similarity.
+"""
+# Standard Library
+import logging
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import NamedTuple
+
+# Third Party
+import numpy as np
+
+from .build import current_build_number, per_build
+from .models.utils import get_import_langs
+from .names import CATEGORIES, language_field
+from .navigation.files import load_array, save_array
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CATEGORIES = ("inventory_type", "solar_system", "constellation", "region")
+# Minimum trigram similarity for a fuzzy match, the pg_trgm default
+SIMILARITY_THRESHOLD = 0.3
+INDEX_PARTS = ("ids", "categories", "names", "name-offsets", "keys", "indptr", "postings", "counts")
+
+
+class SearchResult(NamedTuple):
+    id: int
+    category: str
+    name: str
+    score: float
+
+
+def normalize(text):
+    return unicodedata.normalize("NFKC", text).casefold().strip()
+
+
+def trigrams(text):
+    """
+    The unique trigrams of normalized `text`, each packed as three 21 bit
+    code points in one integer.
+    """
+    padded = [ord(c) for c in f"  {text} "]
+    return {
+        padded[i] << 42 | padded[i + 1] << 21 | padded[i + 2]
+        for i in range(len(padded) - 2)
+    }
+
+
+def _models():
+    # AA Example App
+    from eve_sde.models import Constellation, ItemType, Region, SolarSystem
+
+    return {
+        "inventory_type": ItemType,
+        "solar_system": SolarSystem,
+        "constellation": Constellation,
+        "region": Region,
+    }
+
+
+class _Strings:
+    """
+    Every `step`th utf-8 string from `start` of those packed in `buffer`,
+    as a sequence for `bisect`.
+    """
+
+    def __init__(self, buffer, offsets, start=0, step=1):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.start = start
+        self.step = step
+
+    def __len__(self):
+        return (len(self.offsets) - 1 - self.start + self.step - 1) // self.step
+
+    def __getitem__(self, i):
+        i = self.start + i * self.step
+        return bytes(self.buffer[self.offsets[i]:self.offsets[i + 1]]).decode()
+
+
+class SearchIndex:
+    """
+    Rows sorted by normalized name. `names` holds the normalized name then
+    the display name of each row, `keys[k]` is a trigram and
+    `postings[indptr[k]:indptr[k + 1]]` the rows that have it.
+    """
+
+    def __init__(self, ids, categories, names, name_offsets, keys, indptr, postings, counts):
+        self.ids = ids
+        self.categories = categories
+        self.names = names
+        self.name_offsets = name_offsets
+        self.keys = keys
+        self.indptr = indptr
+        self.postings = postings
+        self.counts = counts
+        self.normalized = _Strings(names, name_offsets, 0, 2)
+        self.display = _Strings(names, name_offsets, 1, 2)
+
+    @classmethod
+    def compute(cls, rows):
+        """
+        Index parts from (id, category, name) rows.
+        """
+        rows = sorted(
+            (normalize(name), _id, CATEGORIES.index(category), name)
+            for _id, category, name in rows if name
+        )
+        encoded = []
+        for norm, _, _, name in rows:
+            encoded += [norm.encode(), name.encode()]
+        name_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=name_offsets[1:])
+
+        grams = [trigrams(r[0]) for r in rows]
+        counts = np.array([len(g) for g in grams], dtype=np.int32)
+        codes = np.fromiter((c for g in grams for c in g), dtype=np.int64, count=int(counts.sum()))
+        owners = np.repeat(np.arange(len(rows), dtype=np.int32), counts)
+        order = np.lexsort((owners, codes))
+        keys, starts = np.unique(codes[order], return_index=True)
+        indptr = np.append(starts, len(codes)).astype(np.int64)
+        return cls(
+            np.array([r[1] for r in rows], dtype=np.int64),
+            np.array([r[2] for r in rows], dtype=np.uint8),
+            np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            name_offsets,
+            keys,
+            indptr,
+            owners[order],
+            counts,
+        )
+
+    @classmethod
+    def from_db(cls, lang):
+        field = language_field(lang)
+        rows = []
+        # modeltranslation reads "name" in the active language
+        columns = list(dict.fromkeys([field, "name_en"]))
+        for category, model in _models().items():
+            rows += [
+                (_id, category, names[0] or names[-1])
+                for _id, *names in model.objects.values_list("id", *columns).iterator()
+            ]
+        return cls.compute(rows)
+
+    def parts(self):
+        return (
+            self.ids,
+            self.categories,
+            self.names,
+            self.name_offsets,
+            self.keys,
+            self.indptr,
+            self.postings,
+            self.counts,
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _result(self, row, score):
+        return SearchResult(
+            int(self.ids[row]),
+            CATEGORIES[self.categories[row]],
+            self.display[row],
+            score
+        )
+
+    def prefix_rows(self, prefix):
+        start = bisect_left(self.normalized, prefix)
+        end = bisect_left(self.normalized, prefix + "\U0010ffff", lo=start)
+        return np.arange(start, end)
+
+    def similarity(self, query):
+        """
+        Trigram similarity of `query` to every row.
+        """
+        grams = np.array(sorted(trigrams(query)), dtype=np.int64)
+        at = np.searchsorted(self.keys, grams)
+        hit = at < len(self.keys)
+        hit[hit] = self.keys[at[hit]] == grams[hit]
+        shared = np.zeros(len(self), dtype=np.int32)
+        for k in at[hit].tolist():
+            shared[self.postings[self.indptr[k]:self.indptr[k + 1]]] += 1
+        return shared / (len(grams) + self.counts - shared)
+
+    def search(self, query, categories=None, limit=20, fuzzy=True):
+        query = normalize(query)
+        if not query:
+            return []
+        allowed = np.ones(len(self), dtype=bool)
+        if categories is not None:
+            allowed = np.isin(self.categories, [CATEGORIES.index(c) for c in categories])
+
+        rows = self.prefix_rows(query)
+        rows = rows[allowed[rows]]
+        lengths = np.diff(self.name_offsets)[2 * rows]
+        # shortest first, the rows are already in name order
+        rows = rows[np.argsort(lengths, kind="stable")][:limit]
+        results = [self._result(row, 1.0) for row in rows.tolist()]
+
+        if fuzzy and len(results) < limit:
+            score = self.similarity(query)
+            score[rows] = 0
+            candidates = np.flatnonzero(allowed & (score >= SIMILARITY_THRESHOLD))
+            best = candidates[np.argsort(-score[candidates], kind="stable")][:limit - len(results)]
+            results += [self._result(row, float(score[row])) for row in best.tolist()]
+        return results
+
+
+def _part_name(lang, part):
+    return f"search-{lang}-{part}"
+
+
+def build_search_indexes():
+    """
+    Post import step, save a search index per imported language.
+    """
+    # AA Example App
+    from eve_sde.models import EveSDE
+
+    build = EveSDE.get_solo().build_number
+    for lang in get_import_langs():
+        start = time.perf_counter()
+        index = SearchIndex.from_db(lang)
+        for part, array in zip(INDEX_PARTS, index.parts()):
+            save_array(_part_name(lang, part), build, array)
+        logger.info(f"Search index for {lang} with {len(index)} names took {time.perf_counter() - start:,.2f}s")
+
+
+@per_build
+def _search_indexes():
+    return {}
+
+
+@per_build
+def _fallback_indexes():
+    return {}
+
+
+def load_search_index(lang, build):
+    """
+    The saved index for `lang` (a `name_<lang>` suffix), None if it has not
+    been saved for `build`.
+    """
+    arrays = []
+    for part in INDEX_PARTS:
+        array = load_array(_part_name(lang, part), build)
+        if array is None:
+            return None
+        arrays.append(array)
+    return SearchIndex(*arrays)
+
+
+def get_search_index(lang="en"):
+    """
+    The saved index for `lang`. Until the post import step has saved it an
+    index is built in memory, and dropped once the saved one can be loaded.
+    """
+    field = language_field(lang)
+    indexes = _search_indexes()
+    if field not in indexes:
+        index = load_search_index(field[len("name_"):], current_build_number())
+        fallbacks = _fallback_indexes()
+        if index is None:
+            if field not in fallbacks:
+                fallbacks[field] = SearchIndex.from_db(lang)
+            return fallbacks[field]
+        indexes[field] = index
+        fallbacks.pop(field, None)
+    return indexes[field]
+
+
+def search(query, lang="en", categories=None, limit=20, fuzzy=True):
+    """
+    Ranked `SearchResult`s for the types and map objects whose name in
+    `lang` (English when not translated) starts with or, with `fuzzy`,
+    resembles `query`.
+    """
+    if categories is not None:
+        unknown = set(categories) - set(SEARCH_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown categories {unknown}, expected some of {SEARCH_CATEGORIES}")
+    return get_search_index(lang).search(query, categories, limit, fuzzy)
+
+
+def clear_cache():
+    _search_indexes.cache_clear()
+    _fallback_indexes.cache_clear()
@@ -0,0 +1,344 @@
+"""
+    Read only columnar snapshot of the hot SDE fields
+
+    Written once per build after each import and memory mapped by every
+    web/celery process, so the pages are shared between workers and lookups
+    never reach the database. Everything is little endian:
+
+    header, 24 bytes
+        magic       8s   b"ESDESNAP"
+        version     u32  SNAPSHOT_VERSION
+        sections    u32  number of section table entries
+        build       i64  EveSDE.build_number
+    section table, 64 bytes per section
+        name        48s  "<table>.<column>", ascii, null padded
+        dtype       4s   numpy dtype string, eg b"<i4\\0"
+        count       u32  number of values
+        offset      u64  from the start of the file, a multiple of 64
+    sections, per table in `TABLES`
+        <table>.ids                  <i8  ids, ascending
+        <table>.<column>                  one value per id, ids are 0 and
+                                          floats NaN if unknown
+        <table>.names.<lang>         |u1  utf-8 names, English when not
+        <table>.name_offsets.<lang>  <i8  translated, the name of row i is
+                                          names[offsets[i]:offsets[i + 1]]
+"""
+# Standard Library
+import io
+import logging
+import mmap
+import os
+import struct
+
+# Third Party
+import numpy as np
+
+from .build import current_build_number, per_build, per_build_loaded
+from .models.utils import get_import_langs
+from .names import language_field
+from .navigation.files import data_path, read_sections, save_file, write_sections
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_NAME = "snapshot"
+SNAPSHOT_EXT = "bin"
+SNAPSHOT_MAGIC = b"ESDESNAP"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<8sIIq")
+SECTION = struct.Struct("<48s4sIQ")
+
+# {table: ((column, values_list field, dtype), ...)}
+TABLES = {
+    "types": (
+        ("group_id", "group_id", "<i4"),
+        ("category_id", "group__category_id", "<i4"),
+        ("volume", "volume", "<f8"),
+        ("published", "published", "|b1"),
+    ),
+    "groups": (
+        ("category_id", "category_id", "<i4"),
+        ("published", "published", "|b1"),
+    ),
+    "categories": (
+        ("published", "published", "|b1"),
+    ),
+    "systems": (
+        ("constellation_id", "constellation_id", "<i4"),
+        ("region_id", "region_id", "<i4"),
+        ("security_status", "security_status", "<f8"),
+        ("x", "x", "<f8"),
+        ("y", "y", "<f8"),
+        ("z", "z", "<f8"),
+    ),
+    "constellations": (
+        ("region_id", "region_id", "<i4"),
+    ),
+    "regions": (),
+}
+
+
+def models_by_table():
+    # AA Example App
+    from eve_sde.models import (
+        Constellation,
+        ItemCategory,
+        ItemGroup,
+        ItemType,
+        Region,
+        SolarSystem,
+    )
+
+    return {
+        "types": ItemType,
+        "groups": ItemGroup,
+        "categories": ItemCategory,
+        "systems": SolarSystem,
+        "constellations": Constellation,
+        "regions": Region,
+    }
+
+
+def compute_table(table, rows, langs):
+    """
+    [(name, array), ...] of the sections of `table` from (id, *columns,
+    English name, *names in `langs`) rows.
+    """
+    columns = TABLES[table]
+    rows = sorted(rows)
+    sections = [(f"{table}.ids", np.array([r[0] for r in rows], dtype=np.int64))]
+    for i, (column, _, dtype) in enumerate(columns, 1):
+        values = [r[i] for r in rows]
+        if np.dtype(dtype).kind == "i":
+            values = [v or 0 for v in values]
+        sections.append((f"{table}.{column}", np.array(values, dtype=np.dtype(dtype))))
+    name = len(columns) + 1
+    for j, lang in enumerate(langs, name + 1):
+        encoded = [(r[j] or r[name] or "").encode() for r in rows]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        sections += [
+            (f"{table}.names.{lang}", np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+            (f"{table}.name_offsets.{lang}", offsets),
+        ]
+    return sections
+
+
+def compute_snapshot():
+    langs = get_import_langs()
+    sections = []
+    for table, model in models_by_table().items():
+        fields = [f for _, f, _ in TABLES[table]]
+        names = ["name_en", *[f"name_{_l}" for _l in langs]]
+        # values_list drops repeated columns, name_en is in `langs`
+        columns = list(dict.fromkeys(names))
+        at = [len(fields) + 1 + columns.index(n) for n in names]
+        rows = (
+            (*r[:len(fields) + 1], *[r[i] for i in at])
+            for r in model.objects.values_list("id", *fields, *columns).iterator()
+        )
+        sections += compute_table(table, rows, langs)
+    return sections
+
+
+def write_snapshot(f, build, sections):
+    write_sections(f, HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(sections), build), sections, SECTION)
+
+
+class SnapshotTable:
+    """
+    Lookups by id over the columns of one table.
+    """
+
+    def __init__(self, arrays):
+        """
+        `arrays` is {column: array} with the table prefix removed.
+        """
+        self.ids = arrays["ids"]
+        self.columns = {}
+        self.names = {}
+        for key, array in arrays.items():
+            if key.startswith("names."):
+                lang = key[len("names."):]
+                self.names[lang] = (array, arrays[f"name_offsets.{lang}"])
+            elif key != "ids" and not key.startswith("name_offsets."):
+                self.columns[key] = array
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, _id):
+        return self.row(_id) is not None
+
+    def rows(self, ids):
+        """
+        The row of each of `ids`, -1 for unknown ids.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        at = np.searchsorted(self.ids, ids).clip(0, max(len(self.ids) - 1, 0))
+        found = self.ids[at] == ids if len(self.ids) else np.zeros(len(ids), dtype=bool)
+        return np.where(found, at, -1)
+
+    def row(self, _id):
+        row = int(self.rows([_id])[0])
+        return None if row < 0 else row
+
+    def column(self, column):
+        try:
+            return self.columns[column]
+        except KeyError:
+            raise KeyError(f"Unknown column {column}, expected one of {list(self.columns)}") from None
+
+    def _value(self, column, row):
+        array = self.column(column)
+        value = array[row].item()
+        if array.dtype.kind == "i" and value == 0:
+            return None
+        if array.dtype.kind == "f" and np.isnan(value):
+            return None
+        return value
+
+    def values(self, column, rows):
+        """
+        `column` of `rows` as a list, None where the value is missing.
+        """
+        array = self.column(column)
+        values = array[rows].tolist()
+        if array.dtype.kind == "i":
+            return [v or None for v in values]
+        if array.dtype.kind == "f":
+            return [None if v != v else v for v in values]
+        return values
+
+    def value(self, _id, column):
+        """
+        `column` of `_id`, None if the id is unknown or the value missing.
+        """
+        row = self.row(_id)
+        return None if row is None else self._value(column, row)
+
+    def _names(self, lang):
+        _lang = language_field(lang)[len("name_"):]
+        # languages that were not imported are English
+        return self.names.get(_lang, self.names["en"])
+
+    def _name(self, names, row):
+        buffer, offsets = names
+        return bytes(buffer[offsets[row]:offsets[row + 1]]).decode()
+
+    def name(self, _id, lang="en"):
+        row = self.row(_id)
+        return None if row is None else self._name(self._names(lang), row)
+
+    def names_of(self, rows, lang="en"):
+        """
+        The names of `rows` in `lang` as a list.
+        """
+        names = self._names(lang)
+        return [self._name(names, row) for row in np.asarray(rows).tolist()]
+
+    def get(self, _id, lang="en"):
+        """
+        {"id", "name", *columns} of `_id`, None if unknown.
+        """
+        row = self.row(_id)
+        if row is None:
+            return None
+        out = {"id": int(self.ids[row]), "name": self._name(self._names(lang), row)}
+        for column in self.columns:
+            out[column] = self._value(column, row)
+        return out
+
+
+class Snapshot:
+    """
+    `snapshot.types`, `snapshot.systems` etc, one `SnapshotTable` per
+    table in `TABLES`.
+    """
+
+    def __init__(self, build, arrays):
+        self.build = build
+        self.tables = {}
+        for table in TABLES:
+            prefix = f"{table}."
+            self.tables[table] = SnapshotTable(
+                {k[len(prefix):]: a for k, a in arrays.items() if k.startswith(prefix)}
+            )
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["tables"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def read_snapshot(buffer):
+    """
+    The `Snapshot` in `buffer`, its arrays are views and never copied.
+    """
+    magic, version, count, build = HEADER.unpack_from(buffer, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"Not a version {SNAPSHOT_VERSION} SDE snapshot")
+    return Snapshot(build, read_sections(buffer, HEADER.size, count, SECTION))
+
+
+def snapshot_path(build):
+    return data_path(SNAPSHOT_NAME, build, SNAPSHOT_EXT)
+
+
+def load_snapshot(build):
+    """
+    Memory map the snapshot for `build`, None if it has not been built.
+    """
+    try:
+        with open(snapshot_path(build), "rb") as f:
+            return read_snapshot(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except FileNotFoundError:
+        return None
+
+
+def build_sde_snapshot():
+    """
+    Post import step, save the snapshot for the current build.
+    """
+    # AA Example App
+    from eve_sde.models import EveSDE
+
+    build = EveSDE.get_solo().build_number
+    sections = compute_snapshot()
+    path = save_file(SNAPSHOT_NAME, build, lambda f: write_snapshot(f, build, sections), SNAPSHOT_EXT)
+    logger.info(f"Saved {path} {os.path.getsize(path):,} bytes")
+
+
+@per_build_loaded
+def _saved_snapshot():
+    return load_snapshot(current_build_number())
+
+
+@per_build
+def _fallback_snapshots():
+    return {}
+
+
+def get_snapshot():
+    """
+    The memory mapped snapshot of the current build. Until the post import
+    step has saved it a snapshot is built in memory, and dropped once the
+    saved one can be loaded.
+    """
+    snapshot = _saved_snapshot()
+    fallbacks = _fallback_snapshots()
+    if snapshot is None:
+        if "snapshot" not in fallbacks:
+            build = current_build_number()
+            logger.info(f"No SDE snapshot for build {build}, building one in memory")
+            f = io.BytesIO()
+            write_snapshot(f, build, compute_snapshot())
+            fallbacks["snapshot"] = read_snapshot(f.getvalue())
+        return fallbacks["snapshot"]
+    fallbacks.pop("snapshot", None)
+    return snapshot
+
+
+def clear_cache():
+    _saved_snapshot.cache_clear()
+    _fallback_snapshots.cache_clear()
@@ -10,13 +10,17 @@ from celery import chain, shared_task
 from allianceauth.services.tasks import QueueOnce
 
 # AA Example App
+from eve_sde import app_settings
 from eve_sde.models import EveSDE
 from eve_sde.sde_tasks import (
     SDE_PARTS_TO_UPDATE,
+    SDE_POST_IMPORT_STEPS,
     check_sde_version,
     delete_sde_folder,
     download_extract_sde,
+    process_post_import_step,
     process_section_of_sde,
+    process_section_of_sde_isolated,
     set_sde_version,
 )
 
@@ -50,6 +54,10 @@ def update_models_from_sde(self, start_id: int = 0):
     queue.append(
         cleanup_sde.si()
     )
+    for id in range(len(SDE_POST_IMPORT_STEPS)):
+        queue.append(
+            post_import_step.si(id)
+        )
     queue
     chain(queue).apply_async()
 
@@ -59,7 +67,17 @@ def update_models_from_sde(self, start_id: int = 0):
     base=QueueOnce,
 )
 def process_sde_section(self, id: int = 0):
-    process_section_of_sde(id)
+    if app_settings.ESDE_SECTION_SUBPROCESS:
+        return process_section_of_sde_isolated(id)
+    return process_section_of_sde(id)
+
+
+@shared_task(
+    bind=True,
+    base=QueueOnce,
+)
+def post_import_step(self, id: int = 0):
+    process_post_import_step(id)
 
 
 @shared_task(
@@ -0,0 +1,59 @@
+"""
+Adaptive batch sizing
+"""
+
+# Django
+from django.test import TestCase
+
+# AA Example App
+from eve_sde import app_settings
+from eve_sde.models import ItemCategory
+from eve_sde.models.batching import AdaptiveBatcher
+
+
+class TestAdaptiveBatcher(TestCase):
+
+    def setUp(self):
+        AdaptiveBatcher._batchers = {}
+        self.fields = list(ItemCategory._meta.concrete_fields)
+        self.models = [ItemCategory(id=i, name=f"cat {i}") for i in range(3000)]
+
+    def test_starts_at_configured_size(self):
+        _b = AdaptiveBatcher.for_model(ItemCategory, "create", self.fields)
+        self.assertEqual(
+            _b.next_size(self.models),
+            min(app_settings.ESDE_BATCH_SIZE, _b.backend_limit(self.models))
+        )
+
+    def test_grows_when_fast_and_shrinks_when_slow(self):
+        _b = AdaptiveBatcher.for_model(ItemCategory, "create", self.fields)
+        _b._backend_limit = 100000
+        _b.record(500, 0.001)
+        self.assertEqual(_b.next_size(self.models), 1000)
+        _b.row_seconds = None
+        _b.record(1000, 10)
+        self.assertEqual(_b.next_size(self.models), 500)
+
+    def test_bounds(self):
+        _b = AdaptiveBatcher.for_model(ItemCategory, "create", self.fields)
+        _b._backend_limit = 100000
+        for _ in range(10):
+            _b.record(_b.size, 0.000001)
+            _b.next_size(self.models)
+        self.assertEqual(_b.size, app_settings.ESDE_BATCH_SIZE_MAX)
+        for _ in range(10):
+            _b.record(_b.size, 100)
+            _b.next_size(self.models)
+        self.assertEqual(_b.size, app_settings.ESDE_BATCH_SIZE_MIN)
+
+    def test_batches_cover_all_models(self):
+        _b = AdaptiveBatcher.for_model(ItemCategory, "create", self.fields)
+        seen = 0
+        for _batch in _b.batches(self.models):
+            self.assertLessEqual(len(_batch), _b.backend_limit(self.models))
+            seen += len(_batch)
+        self.assertEqual(seen, len(self.models))
+
+    def test_create_update_writes_in_batches(self):
+        ItemCategory.create_update(self.models[:1200], [])
+        self.assertEqual(ItemCategory.objects.count(), 1200)
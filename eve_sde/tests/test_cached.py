@@ -0,0 +1,87 @@
+"""
+Build versioned model cache
+"""
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import translation
+
+# AA Example App
+from eve_sde import app_settings
+from eve_sde.build import current_build_number, reset_build_number
+from eve_sde.models import EveSDE, ItemCategory, ItemGroup
+from eve_sde.models.cached import ModelCache
+
+
+class TestModelCache(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ItemCategory.objects.bulk_create([ItemCategory(id=i, name=f"cat {i}") for i in range(1, 4)])
+
+    def setUp(self):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        reset_build_number()
+        current_build_number()
+        ModelCache._caches = {}
+        cache.delete_many(
+            [ItemCategory.cached.cache_key(b, lang, pk) for b in (1, 2) for lang in ("en", "de") for pk in range(1, 5)]
+        )
+
+    def test_get(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(ItemCategory.cached.get(1).name, "cat 1")
+        with self.assertNumQueries(0):
+            self.assertEqual(ItemCategory.cached.get(1).name, "cat 1")
+        # from the django cache
+        ItemCategory.cached.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(ItemCategory.cached.get(1).name, "cat 1")
+
+    def test_get_many(self):
+        ItemCategory.cached.get(1)
+        with self.assertNumQueries(1):
+            found = ItemCategory.cached.get_many([1, 2, 4])
+        self.assertEqual(sorted(found), [1, 2])
+        with self.assertNumQueries(0):
+            self.assertEqual(sorted(ItemCategory.cached.get_many([2, 1])), [1, 2])
+
+    def test_does_not_exist(self):
+        with self.assertRaises(ItemCategory.DoesNotExist):
+            ItemCategory.cached.get(4)
+        # missing pks are cached too
+        with self.assertNumQueries(0):
+            with self.assertRaises(ItemCategory.DoesNotExist):
+                ItemCategory.cached.get(4)
+            self.assertEqual(ItemCategory.cached.get_many([4]), {})
+        ItemCategory.cached.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(ItemCategory.cached.get_many([4]), {})
+
+    def test_new_build(self):
+        ItemCategory.cached.get(1)
+        ItemCategory.objects.filter(id=1).update(name="new")
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 2})
+        reset_build_number()
+        self.assertEqual(ItemCategory.cached.get(1).name, "new")
+
+    def test_per_language(self):
+        ItemCategory.objects.filter(id=1).update(name_de="Kat 1")
+        self.assertEqual(ItemCategory.cached.get(1).name, "cat 1")
+        with translation.override("de"):
+            _category = ItemCategory.cached.get(1)
+        self.assertEqual(_category.name_de, "Kat 1")
+        self.assertIn("name_ko_kr", _category.get_deferred_fields())
+
+    def test_per_model(self):
+        self.assertIsNot(ItemCategory.cached, ItemGroup.cached)
+        with self.assertRaises(AttributeError):
+            ItemCategory(id=9).cached
+
+    def test_lru_size(self):
+        with patch.object(app_settings, "ESDE_MODEL_CACHE_SIZE", 2):
+            ItemCategory.cached.get_many([1, 2, 3])
+        self.assertEqual(len(ItemCategory.cached.local), 2)
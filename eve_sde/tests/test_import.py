@@ -0,0 +1,55 @@
+"""
+SDE import helpers
+"""
+# Standard Library
+import subprocess
+import sys
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+
+# AA Example App
+from eve_sde import app_settings, sde_tasks
+from eve_sde.db import import_transaction, savepoint_batches
+from eve_sde.models import ItemCategory
+
+
+class TestImportTransaction(TestCase):
+
+    @patch.object(app_settings, "ESDE_IMPORT_ATOMIC", True)
+    def test_failed_section_is_rolled_back(self):
+        ItemCategory.objects.create(id=1, name="Old")
+        with self.assertRaises(ValueError):
+            with import_transaction():
+                ItemCategory.objects.all().delete()
+                ItemCategory.create_update([ItemCategory(id=2, name="New")], [])
+                raise ValueError("Broken SDE")
+        self.assertEqual(list(ItemCategory.objects.values_list("name", flat=True)), ["Old"])
+
+    @patch.object(app_settings, "ESDE_IMPORT_SAVEPOINT_BATCHES", 2)
+    def test_savepoint_batches_yields_everything(self):
+        self.assertEqual(list(savepoint_batches(iter([[1], [2], [3]]))), [[1], [2], [3]])
+
+
+class TestSectionSubprocess(TestCase):
+
+    def run_child(self, code):
+        popen = subprocess.Popen
+        with patch.object(
+            sde_tasks.subprocess, "Popen", lambda cmd, **kwargs: popen([sys.executable, "-c", code], **kwargs)
+        ):
+            return sde_tasks.process_section_of_sde_isolated(0)
+
+    def test_stats(self):
+        stats = self.run_child(f"print('loading'); print('{sde_tasks.SECTION_STATS_PREFIX}{{\"total_rows\": 3}}')")
+        self.assertEqual(stats, {"total_rows": 3})
+
+    def test_failed_child(self):
+        with self.assertRaisesRegex(RuntimeError, "exit code 3"):
+            self.run_child("raise SystemExit(3)")
+
+    @patch.object(app_settings, "ESDE_SECTION_SUBPROCESS_TIMEOUT", 0.5)
+    def test_hung_child_is_killed(self):
+        with self.assertRaisesRegex(RuntimeError, "timed out"):
+            self.run_child("import time; time.sleep(60)")
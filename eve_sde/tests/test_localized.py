@@ -0,0 +1,65 @@
+"""
+Language scoped querysets
+"""
+# Django
+from django.test import TestCase
+from django.utils import translation
+
+# AA Example App
+from eve_sde.models import ItemType, Planet, SolarSystem, Stargate
+
+
+class TestLocalized(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ItemType.objects.create(id=34, name="Tritanium", name_de="Tritanium DE", description="A mineral")
+        SolarSystem.objects.create(id=30000142, name="Jita", name_de="Jita DE")
+        Planet.objects.create(id=40009077, name="Jita I", solar_system_id=30000142)
+        Stargate.objects.create(id=50001248, name="", solar_system_id=30000142)
+
+    def test_defers_other_languages(self):
+        with translation.override("de"):
+            _type = ItemType.objects.localized().get(id=34)
+            deferred = _type.get_deferred_fields()
+            self.assertIn("description_ko_kr", deferred)
+            self.assertIn("name_zh_hans", deferred)
+            self.assertNotIn("name_de", deferred)
+            self.assertNotIn("description_en", deferred)
+            with self.assertNumQueries(0):
+                self.assertEqual(_type.name, "Tritanium DE")
+                # falls back to English
+                self.assertEqual(_type.description, "A mineral")
+
+    def test_explicit_language(self):
+        deferred = ItemType.objects.localized("ko-kr").get(id=34).get_deferred_fields()
+        self.assertNotIn("name_ko_kr", deferred)
+        self.assertIn("name_de", deferred)
+
+    def test_planet_manager(self):
+        with translation.override("de"):
+            with self.assertNumQueries(1):
+                planet = Planet.objects.get(id=40009077)
+                self.assertEqual(planet.localized_name, "Jita I")
+            self.assertIn("name_ko_kr", planet.get_deferred_fields())
+            planet = Planet.objects.with_relations().get(id=40009077)
+            with self.assertNumQueries(0):
+                self.assertEqual(planet.solar_system.name, "Jita DE")
+            self.assertIn("name_ko_kr", planet.solar_system.get_deferred_fields())
+
+    def test_relocalize_replaces_defers(self):
+        with translation.override("de"):
+            planet = Planet.objects.localized("ko").get(id=40009077)
+            deferred = planet.get_deferred_fields()
+            self.assertNotIn("name_ko_kr", deferred)
+            self.assertIn("name_de", deferred)
+            with self.assertNumQueries(0):
+                self.assertIsNone(planet.name_ko_kr)
+            planet = Planet.objects.with_relations().localized("ko", related=["solar_system"]).get(id=40009077)
+            self.assertNotIn("name_ko_kr", planet.solar_system.get_deferred_fields())
+        # other deferred columns are kept
+        planet = Planet.objects.defer("radius").localized("ko").get(id=40009077)
+        self.assertIn("radius", planet.get_deferred_fields())
+
+    def test_not_translated(self):
+        self.assertEqual(Stargate.objects.localized().get(id=50001248).get_deferred_fields(), set())
@@ -0,0 +1,106 @@
+"""
+Map section imports
+"""
+# Standard Library
+import tempfile
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+
+# AA Example App
+from eve_sde import app_settings
+from eve_sde.models import (
+    Constellation,
+    ItemType,
+    Moon,
+    Planet,
+    Region,
+    SolarSystem,
+)
+
+from .utils import MAP_SDE, write_sde
+
+
+class TestMapImport(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        with tempfile.TemporaryDirectory() as folder:
+            write_sde(folder, MAP_SDE)
+            for mdl in (ItemType, Region, Constellation, SolarSystem, Planet, Moon):
+                mdl.load_from_sde(folder)
+
+    def test_hierarchy_is_denormalized(self):
+        self.assertEqual(SolarSystem.objects.get(id=30000001).region_id, 10000001)
+        planet = Planet.objects.get(id=40000002)
+        self.assertEqual((planet.constellation_id, planet.region_id), (20000001, 10000001))
+        self.assertEqual(
+            set(Moon.objects.filter(region_id=10000001).values_list("id", flat=True)),
+            {40000003, 40000004}
+        )
+
+    def test_names(self):
+        self.assertEqual(Planet.objects.get(id=40000002).name, "Tanoo I")
+        self.assertEqual(Planet.objects.get(id=40000002).name_de, "Tanoo DE I")
+        self.assertEqual(Moon.objects.get(id=40000004).name, "Tanoo I - Moon 2")
+        self.assertEqual(Moon.objects.get(id=40000004).name_de, "Tanoo DE I - Mond 2")
+
+    def test_format_names_match_format_name(self):
+        langs = ["en", "de", "ko_kr"]
+        for mdl, filename in ((Planet, "mapPlanets.jsonl"), (Moon, "mapMoons.jsonl")):
+            lookup = mdl.name_lookup()
+            for row in MAP_SDE[filename]:
+                self.assertEqual(
+                    mdl.format_names(row, lookup, langs),
+                    {lang: mdl.format_name(row, lookup, lang) for lang in langs}
+                )
+
+    def test_moon_prefixes_are_not_kept(self):
+        lookup = Moon.name_lookup()
+        for row in MAP_SDE["mapMoons.jsonl"]:
+            Moon.format_names(row, lookup, ["en", "de"])
+        # only the prefixes of the last planet are kept
+        self.assertEqual(lookup["prefix"][0], (row["orbitID"], row["typeID"]))
+
+
+class TestLanguageSubset(TestCase):
+
+    @classmethod
+    @patch.object(app_settings, "ESDE_LANGUAGES", ["ko"])
+    def setUpTestData(cls):
+        with tempfile.TemporaryDirectory() as folder:
+            sde = dict(MAP_SDE)
+            sde["mapSolarSystems.jsonl"] = [
+                MAP_SDE["mapSolarSystems.jsonl"][0] | {"name": {"en": "Tanoo", "de": "Tanoo DE", "ko": "타누"}}
+            ]
+            write_sde(folder, sde)
+            for mdl in (ItemType, Region, Constellation, SolarSystem, Planet, Moon):
+                mdl.load_from_sde(folder)
+
+    def test_only_configured_languages(self):
+        system = SolarSystem.objects.get(id=30000001)
+        self.assertEqual((system.name_en, system.name_ko_kr, system.name_de), ("Tanoo", "타누", None))
+        planet = Planet.objects.get(id=40000002)
+        self.assertEqual((planet.name_en, planet.name_ko_kr, planet.name_de), ("Tanoo I", "타누 I", None))
+        self.assertIsNone(Moon.objects.get(id=40000004).name_de)
+
+    def test_dropped_language_is_cleared(self):
+        with tempfile.TemporaryDirectory() as folder, patch.object(app_settings, "ESDE_LANGUAGES", ["de"]):
+            sde = dict(MAP_SDE)
+            sde["mapSolarSystems.jsonl"] = [
+                MAP_SDE["mapSolarSystems.jsonl"][0] | {"name": {"en": "Tanoo", "de": "Tanoo DE", "ko": "타누"}}
+            ]
+            write_sde(folder, sde)
+            for mdl in (SolarSystem, Planet):
+                mdl.load_from_sde(folder)
+        system = SolarSystem.objects.get(id=30000001)
+        self.assertEqual((system.name_en, system.name_ko_kr, system.name_de), ("Tanoo", None, "Tanoo DE"))
+        self.assertIsNone(Planet.objects.get(id=40000002).name_ko_kr)
+
+    @patch.object(app_settings, "ESDE_LANGUAGES", ["de", "zh-hans"])
+    def test_update_fields(self):
+        self.assertEqual(
+            SolarSystem.get_update_fields()[-3:],
+            ["name_en", "name_de", "name_zh_hans"]
+        )
@@ -0,0 +1,64 @@
+"""
+Bulk id to name resolution
+"""
+# Django
+from django.test import TestCase
+from django.utils import translation
+
+# AA Example App
+from eve_sde.build import reset_build_number
+from eve_sde.models import EveSDE, ItemCategory, ItemGroup, ItemType, SolarSystem
+from eve_sde.names import ResolvedName, clear_cache, resolve_names
+
+
+class TestResolveNames(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        ItemCategory.objects.create(id=4, name="Material", name_de="Material DE")
+        ItemGroup.objects.create(id=18, name="Mineral")
+        ItemType.objects.create(id=18, name="Plagioclase", name_de="Plagioklas")
+        ItemType.objects.create(id=34, name="Tritanium", name_ko_kr="트리타늄")
+        SolarSystem.objects.create(id=30000142, name="Jita", name_zh_hans="吉他")
+
+    def setUp(self):
+        reset_build_number()
+        clear_cache()
+
+    def test_resolve(self):
+        self.assertEqual(
+            resolve_names([34, 30000142, 4, 99]),
+            {
+                34: ResolvedName("inventory_type", "Tritanium"),
+                30000142: ResolvedName("solar_system", "Jita"),
+                4: ResolvedName("category", "Material"),
+            }
+        )
+
+    def test_languages(self):
+        self.assertEqual(resolve_names([34], "ko")[34].name, "트리타늄")
+        self.assertEqual(resolve_names([30000142], "zh-hans")[30000142].name, "吉他")
+        # missing translations fall back to English
+        self.assertEqual(resolve_names([34], "de")[34].name, "Tritanium")
+        with translation.override("de"):
+            self.assertEqual(resolve_names([4])[4].name, "Material")
+        with self.assertRaises(ValueError):
+            resolve_names([34], "xx")
+
+    def test_fallback_is_english_in_any_request_language(self):
+        with translation.override("de"):
+            self.assertEqual(resolve_names([4], "ko")[4].name, "Material")
+            self.assertEqual(resolve_names([34], "de")[34].name, "Tritanium")
+
+    def test_overlapping_ids(self):
+        self.assertEqual(resolve_names([18])[18], ResolvedName("inventory_type", "Plagioclase"))
+        self.assertEqual(resolve_names([18], categories=["group"])[18], ResolvedName("group", "Mineral"))
+        self.assertEqual(resolve_names([18, 34], categories=["category"]), {})
+        with self.assertRaises(ValueError):
+            resolve_names([18], categories=["station"])
+
+    def test_one_index_per_language(self):
+        resolve_names([34])
+        with self.assertNumQueries(0):
+            resolve_names(list(range(1000)) + [34])
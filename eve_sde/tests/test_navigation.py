@@ -0,0 +1,444 @@
+"""
+Stargate graph and routing
+"""
+# Standard Library
+import random
+import tempfile
+import time
+from unittest.mock import patch
+
+# Third Party
+import numpy as np
+
+# Django
+from django.test import RequestFactory, TestCase
+
+# AA Example App
+from eve_sde import app_settings, views
+from eve_sde.build import reset_build_number
+from eve_sde.models import EveSDE, Region, SolarSystem, Stargate
+from eve_sde.navigation import (
+    bundle,
+    gates,
+    hierarchy,
+    isochrones,
+    jump_drive,
+    jump_matrix,
+    neighbours,
+    overlay,
+    spatial,
+    weighted,
+)
+
+# A - B - C - D      E - F  (E/F not connected to the rest)
+#     |       |
+#     +-- G --+
+SYSTEMS = {
+    1: ("A", 1.0),
+    2: ("B", 0.9),
+    3: ("C", 0.6),
+    4: ("D", 0.5),
+    5: ("E", -0.2),
+    6: ("F", -0.5),
+    7: ("G", -0.1),
+}
+LINKS = [(1, 2), (2, 3), (3, 4), (5, 6), (2, 7), (7, 4)]
+
+
+def create_universe():
+    SolarSystem.objects.bulk_create(
+        [
+            SolarSystem(id=_id, name=name, security_status=sec, x=_id * spatial.METRES_PER_LY, y=0, z=0)
+            for _id, (name, sec) in SYSTEMS.items()
+        ]
+    )
+    gate_id = 50000000
+    _gates = []
+    for a, b in LINKS:
+        for src, dst in ((a, b), (b, a)):
+            gate_id += 1
+            _gates.append(Stargate(id=gate_id, name="", solar_system_id=src, destination_id=dst))
+    Stargate.objects.bulk_create(_gates)
+
+
+class NavigationTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        create_universe()
+
+    def setUp(self):
+        gates.clear_cache()
+
+
+class TestGateGraph(NavigationTestCase):
+
+    def test_route(self):
+        self.assertEqual(gates.route(1, 4), [1, 2, 3, 4])
+        self.assertEqual(gates.jumps(1, 4), 3)
+        self.assertEqual(gates.route(1, 1), [1])
+
+    def test_no_route(self):
+        self.assertIsNone(gates.route(1, 5))
+        self.assertIsNone(gates.jumps(1, 99))
+
+    def test_systems_within(self):
+        self.assertEqual(gates.systems_within(1, 2), {1: 0, 2: 1, 3: 2, 7: 2})
+        self.assertEqual(gates.systems_within(5, 10), {5: 0, 6: 1})
+
+    def test_neighbours(self):
+        self.assertEqual(gates.get_gate_graph().neighbours(2), [1, 3, 7])
+
+    def test_routes_are_cached(self):
+        gates.route(1, 4)
+        with self.assertNumQueries(0):
+            gates.route(1, 4)
+
+
+class TestWeightedRoutes(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        weighted.clear_cache()
+
+    def test_flags(self):
+        # B - C - D passes the 0.6 C, B - G - D passes the -0.1 G
+        self.assertEqual(len(weighted.route(2, 4)), 3)
+        self.assertEqual(weighted.route(1, 4, weighted.ROUTE_SECURE), [1, 2, 3, 4])
+        self.assertEqual(weighted.route(1, 4, weighted.ROUTE_INSECURE), [1, 2, 7, 4])
+
+    def test_avoid(self):
+        self.assertEqual(weighted.route(1, 4, avoid=[3]), [1, 2, 7, 4])
+        self.assertIsNone(weighted.route(1, 4, avoid=[3, 7]))
+
+    def test_routes_from(self):
+        self.assertEqual(
+            weighted.routes_from(1, [4, 5, 7]),
+            {4: [1, 2, 3, 4], 5: None, 7: [1, 2, 7]}
+        )
+
+    def test_routes_from_avoided_destination(self):
+        # 2 may end its own route but the route to 4 can not pass it
+        self.assertEqual(
+            weighted.routes_from(1, [2, 4], avoid=[2]),
+            {2: [1, 2], 4: None}
+        )
+        self.assertEqual(weighted.routes_from(1, [4, 7], avoid=[7])[4], [1, 2, 3, 4])
+
+    def test_unknown_flag(self):
+        with self.assertRaises(ValueError):
+            weighted.route(1, 4, "fastest")
+
+
+class TestIsochrones(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        isochrones.clear_cache()
+
+    def test_matches_single_source(self):
+        for max_jumps in range(4):
+            self.assertEqual(
+                isochrones.systems_within_many(list(SYSTEMS), max_jumps),
+                {_id: gates.systems_within(_id, max_jumps) for _id in SYSTEMS}
+            )
+
+    def test_unknown_and_any(self):
+        self.assertEqual(isochrones.systems_within_many([99, 5], 1), {99: {}, 5: {5: 0, 6: 1}})
+        self.assertEqual(isochrones.systems_within_any([1, 4], 1), {1: 0, 2: 1, 3: 1, 4: 0, 7: 1})
+        self.assertEqual(isochrones.systems_within_any([99], 1), {})
+
+    def test_rows_are_cached(self):
+        sources, rows = isochrones.jump_rows([4, 1, 1], 2)
+        self.assertEqual(sources, (1, 4))
+        self.assertFalse(rows.flags.writeable)
+        with self.assertNumQueries(0):
+            self.assertIs(isochrones.jump_rows([1, 4], 2)[1], rows)
+
+
+class TestOverlay(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        overlay.clear_cache()
+        self.addCleanup(overlay.delete_layer, "bridges")
+        self.addCleanup(overlay.delete_layer, "thera")
+
+    def test_bridge(self):
+        overlay.set_layer("bridges", [(1, 4)])
+        self.assertEqual(overlay.route(1, 4, ["bridges"]), [1, 4])
+        self.assertEqual(overlay.jumps(1, 3, ["bridges"]), 2)
+        self.assertEqual(overlay.route(1, 4), [1, 2, 3, 4])
+        self.assertEqual(gates.route(1, 4), [1, 2, 3, 4])
+        self.assertEqual(overlay.systems_within(1, 1, ["bridges"]), {1: 0, 2: 1, 4: 1})
+
+    def test_new_system_and_expiry(self):
+        # 99 has no stargates, like Thera
+        overlay.set_layer("thera", [(1, 99), (99, 5, time.time() - 1)])
+        self.assertIsNone(overlay.route(1, 6, ["thera"]))
+        self.assertEqual(overlay.get_layer("thera"), [(1, 99)])
+        overlay.set_layer("thera", [(1, 99), (99, 5, time.time() + 60)])
+        self.assertEqual(overlay.route(1, 6, ["thera"]), [1, 99, 5, 6])
+        self.assertEqual(overlay.route(6, 4, ["thera", "bridges"]), [6, 5, 99, 1, 2, 3, 4])
+
+    def test_versions(self):
+        overlay.set_layer("bridges", [(1, 4)])
+        overlay.set_layer("thera", [(1, 5)])
+        overlay.route(1, 4, ["bridges"])
+        overlay.route(1, 6, ["thera"])
+        bridges = overlay.get_overlay(["bridges"])
+        overlay.set_layer("thera", [(1, 6)])
+        self.assertEqual(overlay.get_overlay(["bridges"]), bridges)
+        self.assertEqual(overlay.route(1, 6, ["thera"]), [1, 6])
+        overlay.delete_layer("bridges")
+        self.assertEqual(overlay.route(1, 4, ["bridges"]), [1, 2, 3, 4])
+
+
+class TestHierarchicalRoutes(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        hierarchy.clear_cache()
+
+    def assertMatchesBfs(self, graph, _hierarchy):
+        edges = set(zip(np.repeat(graph.ids, np.diff(graph.indptr)).tolist(), graph.ids[graph.indices].tolist()))
+        for a in graph.ids.tolist():
+            for b in graph.ids.tolist():
+                _route = _hierarchy.route(a, b)
+                self.assertEqual(_hierarchy.jumps(a, b), graph.jumps(a, b))
+                if _route is not None:
+                    self.assertEqual((_route[0], _route[-1]), (a, b))
+                    self.assertTrue(edges.issuperset(zip(_route, _route[1:])))
+
+    def test_regions(self):
+        Region.objects.bulk_create([Region(id=10, name="R1"), Region(id=20, name="R2")])
+        SolarSystem.objects.filter(id__in=[1, 2, 5, 6]).update(region_id=10)
+        SolarSystem.objects.filter(id__in=[3, 4, 7]).update(region_id=20)
+        self.assertEqual(hierarchy.route(1, 4), [1, 2, 3, 4])
+        self.assertEqual(hierarchy.jumps(7, 3), 2)
+        self.assertIsNone(hierarchy.route(1, 6))
+        _hierarchy = hierarchy.get_hierarchy()
+        self.assertEqual(_hierarchy.graph.ids[_hierarchy.portals].tolist(), [2, 3, 7])
+        self.assertMatchesBfs(gates.get_gate_graph(), _hierarchy)
+
+    def test_matches_bfs(self):
+        rng = random.Random(1)
+        for _ in range(3):
+            edges = set()
+            for _ in range(120):
+                a, b = rng.randint(1, 60), rng.randint(1, 60)
+                if a != b:
+                    edges |= {(a, b), (b, a)}
+            graph = gates.GateGraph(sorted(edges))
+            groups = [rng.randint(1, 6) for _ in graph.ids]
+            self.assertMatchesBfs(graph, hierarchy.HierarchicalGraph(graph, groups))
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            hierarchy.HierarchicalGraph.from_db(gates.get_gate_graph(), "name")
+
+
+class TestJumpMatrix(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = patch.object(app_settings, "ESDE_DATA_DIR", self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+        jump_matrix.get_jump_matrix.cache_clear()
+
+    def test_matches_graph_search(self):
+        graph = gates.get_gate_graph()
+        matrix = jump_matrix.compute_jump_matrix(graph, processes=1)
+        _jumps = jump_matrix.JumpMatrix(graph.ids, matrix)
+        for a in SYSTEMS:
+            for b in SYSTEMS:
+                self.assertEqual(_jumps.jumps(a, b), gates.jumps(a, b))
+
+    def test_build_and_load(self):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        reset_build_number()
+        jump_matrix.build_jump_matrix()
+        _matrix = jump_matrix.get_jump_matrix()
+        self.assertIsInstance(_matrix.matrix, np.memmap)
+        self.assertEqual(jump_matrix.jumps(1, 4), 3)
+        self.assertEqual(_matrix.jumps_from(1, [4, 5, 99]).tolist(), [3, -1, -1])
+
+    def test_loaded_once_built(self):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        reset_build_number()
+        # asked before the post import step, falls back to the graph
+        self.assertIsNone(jump_matrix.get_jump_matrix())
+        self.assertEqual(jump_matrix.jumps(1, 4), 3)
+        jump_matrix.build_jump_matrix()
+        self.assertIsInstance(jump_matrix.get_jump_matrix().matrix, np.memmap)
+
+
+class TestUniverseBundle(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = patch.object(app_settings, "ESDE_DATA_DIR", self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 7})
+        reset_build_number()
+
+    def test_build_and_load(self):
+        SolarSystem.objects.create(id=8, name="H", security_status=None)
+        bundle.build_universe_bundle()
+        build, arrays = bundle.load_bundle(7)
+        self.assertEqual(build, 7)
+        self.assertEqual(arrays["ids"].tolist(), [1, 2, 3, 4, 5, 6, 7, 8])
+        graph = gates.get_gate_graph()
+        for i, _id in enumerate(arrays["ids"].tolist()):
+            nbrs = arrays["indices"][arrays["indptr"][i]:arrays["indptr"][i + 1]]
+            self.assertEqual(arrays["ids"][nbrs].tolist(), graph.neighbours(_id))
+        self.assertEqual(arrays["coords"].shape, (8, 3))
+        self.assertAlmostEqual(float(arrays["coords"][3, 0]), 4)
+        self.assertTrue(np.isnan(arrays["coords"][7]).all())
+        self.assertAlmostEqual(float(arrays["security"][1]), 0.9, places=5)
+        self.assertEqual(arrays["region_id"].tolist(), [0] * 8)
+        for array in arrays.values():
+            self.assertFalse(array.flags.owndata)
+            self.assertEqual(array.ctypes.data % array.itemsize, 0)
+
+    def test_view(self):
+        factory = RequestFactory()
+        response = views.universe_bundle(factory.get("/"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], str(views.BUNDLE_RETRY_SECONDS))
+        self.assertFalse(response.has_header("ETag"))
+        # an ETag of the build from before the bundle was saved is not a 304
+        response = views.universe_bundle(factory.get("/", HTTP_IF_NONE_MATCH='"esde-7"'))
+        self.assertEqual(response.status_code, 503)
+        bundle.build_universe_bundle()
+        response = views.universe_bundle(factory.get("/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(bundle.read_bundle(b"".join(response.streaming_content))[0], 7)
+        response = views.universe_bundle(factory.get("/", HTTP_IF_NONE_MATCH=response["ETag"]))
+        self.assertEqual(response.status_code, 304)
+
+
+class TestSpatialIndex(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        spatial.get_spatial_index.cache_clear()
+
+    def test_distance(self):
+        self.assertAlmostEqual(spatial.distance_ly(1, 4), 3)
+        self.assertIsNone(spatial.distance_ly(1, 99))
+
+    def test_systems_in_range(self):
+        self.assertEqual([s for s, _ in spatial.systems_in_range(3, 1.5)], [2, 4])
+        self.assertEqual([s for s, _ in spatial.systems_in_range(1, 20)], [2, 3, 4, 5, 6, 7])
+        self.assertEqual(spatial.systems_in_range(1, 0.5), [])
+
+    def test_nearest(self):
+        self.assertEqual([s for s, _ in spatial.nearest(1, 2)], [2, 3])
+        self.assertEqual(len(spatial.nearest(1, 50)), 6)
+
+    def test_isolated_system(self):
+        far = 10 ** 6 * spatial.METRES_PER_LY
+        index = spatial.SpatialIndex([1, 2, 3], [(0, 0, 0), (spatial.METRES_PER_LY, 0, 0), (far, far, far)])
+        self.assertEqual([s for s, _ in index.nearest(3, 5)], [2, 1])
+        self.assertEqual([s for s, _ in index.systems_in_range(1, 10 ** 7)], [2, 3])
+
+    def test_bulk(self):
+        self.assertEqual(
+            spatial.systems_in_range_many([1, 7], 1),
+            {1: [(2, 1.0)], 7: [(6, 1.0)]}
+        )
+        self.assertEqual(spatial.nearest_many([7], 1), {7: [(6, 1.0)]})
+
+
+class TestNeighbourLists(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = patch.object(app_settings, "ESDE_DATA_DIR", self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+        spatial.get_spatial_index.cache_clear()
+        neighbours.get_neighbour_lists.cache_clear()
+
+    def test_matches_spatial_index(self):
+        index = spatial.get_spatial_index()
+        # small blocks so the lists are built across several
+        with patch.object(neighbours, "BLOCK_SIZE", 3):
+            lists = neighbours.NeighbourLists(index.ids, *neighbours.compute_neighbours(index, 4), 4)
+        for _id in SYSTEMS:
+            for ly in (0.5, 1, 2.5, 4):
+                self.assertEqual(
+                    [s for s, _ in lists.within(_id, ly)],
+                    [s for s, _ in index.systems_in_range(_id, ly)]
+                )
+
+    def test_build_and_manager(self):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        reset_build_number()
+        self.assertIsNone(neighbours.get_neighbour_lists())
+        with patch.object(app_settings, "ESDE_JUMP_RANGES", [2, 3]):
+            neighbours.build_neighbour_lists()
+            # picked up without clearing the cache once the lists are saved
+            self.assertEqual(neighbours.get_neighbour_lists().max_ly, 3)
+            self.assertEqual(neighbours.systems_within_ly(1, 2), [(2, 1.0), (3, 2.0)])
+            self.assertEqual(
+                set(SolarSystem.objects.in_jump_range(4, 3).values_list("id", flat=True)),
+                {1, 2, 3, 5, 6, 7}
+            )
+            # beyond the built range falls back to the spatial index
+            self.assertEqual(len(neighbours.systems_within_ly(1, 10)), 6)
+        # raising the setting doesn't change the range the lists were built for
+        with patch.object(app_settings, "ESDE_JUMP_RANGES", [5]):
+            lists = neighbours.get_neighbour_lists()
+            self.assertEqual(lists.max_ly, 3)
+            with self.assertRaises(ValueError):
+                lists.within(1, 5)
+            self.assertEqual(len(neighbours.systems_within_ly(1, 5)), 5)
+
+
+@patch.object(jump_drive, "KSPACE_IDS", (0, 100))
+class TestJumpDrive(NavigationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        spatial.get_spatial_index.cache_clear()
+        jump_drive.clear_cache()
+
+    def test_plan(self):
+        # only E, F and G at x = 5, 6 and 7 LY are low/null sec
+        _plan = jump_drive.plan(1, 6, 5)
+        self.assertEqual(_plan.systems, (1, 6))
+        self.assertAlmostEqual(_plan.distance_ly, 5)
+        self.assertEqual(jump_drive.plan(1, 6, 4.5).systems, (1, 5, 6))
+        self.assertEqual(jump_drive.plan(1, 7, 4.5).systems, (1, 5, 7))
+
+    def test_distance_mode(self):
+        _plan = jump_drive.plan(5, 7, 2, jump_drive.MODE_DISTANCE)
+        self.assertAlmostEqual(_plan.distance_ly, 2)
+
+    def test_no_high_sec_or_unreachable(self):
+        self.assertIsNone(jump_drive.plan(5, 2, 10))
+        self.assertIsNone(jump_drive.plan(1, 6, 3.5))
+
+    def test_avoid(self):
+        self.assertIsNone(jump_drive.plan(1, 6, 4.5, avoid=[5]))
+        self.assertEqual(jump_drive.plan(1, 6, 5, avoid=[5]).systems, (1, 6))
+
+    def test_uses_neighbour_lists(self):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        reset_build_number()
+        with tempfile.TemporaryDirectory() as data_dir, patch.object(app_settings, "ESDE_DATA_DIR", data_dir):
+            neighbours.get_neighbour_lists.cache_clear()
+            neighbours.build_neighbour_lists()
+            with patch.object(spatial.SpatialIndex, "indexes_in_range", side_effect=AssertionError):
+                self.assertEqual(jump_drive.plan(1, 7, 4.5).systems, (1, 5, 7))
+            neighbours.get_neighbour_lists.cache_clear()
@@ -0,0 +1,72 @@
+"""
+Pasted item list parsing
+"""
+# Django
+from django.test import TestCase
+from django.utils import translation
+
+# AA Example App
+from eve_sde.build import current_build_number, reset_build_number
+from eve_sde.models import EveSDE, ItemType
+from eve_sde.parsing import clear_cache, parse_items
+
+
+class TestParseItems(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        ItemType.objects.create(id=34, name="Tritanium", name_de="Tritanium", name_ko_kr="트리타늄", published=True)
+        ItemType.objects.create(id=35, name="Pyerite", name_de="Pyerit", published=True)
+        ItemType.objects.create(id=587, name="Rifter", published=True)
+        ItemType.objects.create(id=2873, name="125mm Gatling AutoCannon II", published=True)
+        ItemType.objects.create(id=12625, name="EMP S", published=True)
+        ItemType.objects.create(id=2488, name="Warrior II", published=True)
+        # unpublished duplicate names lose
+        ItemType.objects.create(id=99, name="Pyerit", published=False)
+        # English names win over another type's translation
+        ItemType.objects.create(id=40, name="Megacyte", published=True)
+        ItemType.objects.create(id=41, name="Zydrine", name_de="Megacyte", published=True)
+
+    def setUp(self):
+        reset_build_number()
+        current_build_number()
+        clear_cache()
+
+    def test_inventory_copy(self):
+        self.assertEqual(
+            parse_items("Tritanium\t1,000\tMineral\tMaterial\t\t\t10 m3\nPyerite\t\tMineral"),
+            ([(34, 1000), (35, 1)], [])
+        )
+
+    def test_free_text_and_languages(self):
+        self.assertEqual(
+            parse_items("Tritanium 1 000\n10x Pyerit\n트리타늄 x5\n3 Warrior II\nNot A Type 5\n\n"),
+            ([(34, 1005), (35, 10), (2488, 3)], ["Not A Type 5"])
+        )
+
+    def test_eft(self):
+        fit = (
+            "[Rifter, My Rifter]\n"
+            "125mm Gatling AutoCannon II, EMP S\n"
+            "125mm Gatling AutoCannon II, EMP S /OFFLINE\n"
+            "[Empty High slot]\n"
+            "\n"
+            "Warrior II x2\n"
+            "EMP S x100\n"
+        )
+        self.assertEqual(
+            parse_items(fit),
+            ([(587, 1), (2873, 2), (2488, 2), (12625, 100)], [])
+        )
+
+    def test_english_names_win(self):
+        # the names are built in a German request but English still wins
+        with translation.override("de"):
+            self.assertEqual(parse_items("Megacyte 5\nZydrine"), ([(40, 5), (41, 1)], []))
+
+    def test_one_query(self):
+        with self.assertNumQueries(1):
+            parse_items("Tritanium 10\n" * 500)
+        with self.assertNumQueries(0):
+            parse_items("Pyerite 10\n" * 500)
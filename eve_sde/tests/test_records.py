@@ -0,0 +1,92 @@
+"""
+Lightweight SDE records
+"""
+# Standard Library
+import tempfile
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+from django.utils import translation
+
+# AA Example App
+from eve_sde import app_settings, records, snapshot
+from eve_sde.build import current_build_number, reset_build_number
+from eve_sde.models import (
+    Constellation,
+    EveSDE,
+    ItemCategory,
+    ItemGroup,
+    ItemType,
+    Region,
+    SolarSystem,
+)
+from eve_sde.snapshot import TABLES
+
+
+class TestRecords(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        ItemCategory.objects.create(id=4, name="Material", published=True)
+        ItemGroup.objects.create(id=18, name="Mineral", name_de="Mineral DE", category_id=4, published=True)
+        ItemType.objects.create(id=34, name="Tritanium", name_de="Tritanium DE", group_id=18, volume=0.01, published=True)
+        ItemType.objects.create(id=35, name="Pyerite")
+        Region.objects.create(id=10000002, name="The Forge")
+        Constellation.objects.create(id=20000020, name="Kimotoro", region_id=10000002)
+        SolarSystem.objects.create(
+            id=30000142, name="Jita", constellation_id=20000020, region_id=10000002, security_status=0.9459
+        )
+
+    def setUp(self):
+        reset_build_number()
+        snapshot.clear_cache()
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = patch.object(app_settings, "ESDE_DATA_DIR", self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+
+    def test_fields_match_snapshot(self):
+        for table, record in records.RECORDS.items():
+            self.assertEqual(record._fields, ("id", "name", *[c for c, _, _ in TABLES[table]]))
+
+    def test_get_records(self):
+        self.assertEqual(
+            records.get_records("types", [34, 35, 99], "de"),
+            {
+                34: records.TypeRecord(34, "Tritanium DE", 18, 4, 0.01, True),
+                35: records.TypeRecord(35, "Pyerite", None, None, None, False),
+            }
+        )
+        self.assertEqual(set(records.get_records("types")), {34, 35})
+        self.assertIsNone(records.get_record("types", 99))
+        with self.assertRaises(ValueError):
+            records.get_records("stargates")
+
+    def test_relations(self):
+        snapshot.build_sde_snapshot()
+        snapshot.get_snapshot()
+        current_build_number()
+        with self.assertNumQueries(0):
+            _type = records.get_record("types", 34)
+            self.assertEqual(_type.group("de").name, "Mineral DE")
+            self.assertEqual(_type.category(), records.CategoryRecord(4, "Material", True))
+            self.assertIsNone(records.get_record("types", 35).group())
+            system = records.get_record("systems", 30000142)
+            self.assertEqual(system.constellation().name, "Kimotoro")
+            self.assertEqual(system.region().name, "The Forge")
+            self.assertEqual(system.constellation().region().id, 10000002)
+
+    def test_from_queryset(self):
+        self.assertEqual(
+            records.from_queryset(ItemType.objects.filter(published=True), "de"),
+            [records.TypeRecord(34, "Tritanium DE", 18, 4, 0.01, True)]
+        )
+        self.assertEqual(records.from_queryset(SolarSystem.objects.all())[0].security_status, 0.9459)
+        # untranslated names are English, not the active language
+        with translation.override("de"):
+            self.assertEqual(records.from_queryset(ItemType.objects.filter(id=34), "ko")[0].name, "Tritanium")
+        with self.assertRaises(ValueError):
+            records.from_queryset(EveSDE.objects.all())
@@ -0,0 +1,86 @@
+"""
+Name search index
+"""
+# Standard Library
+import tempfile
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+from django.utils import translation
+
+# AA Example App
+from eve_sde import app_settings, search
+from eve_sde.build import current_build_number, reset_build_number
+from eve_sde.models import EveSDE, ItemType, Region, SolarSystem
+
+
+class TestSearch(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        ItemType.objects.create(id=34, name="Tritanium", name_de="Tritanium", name_ko_kr="트리타늄")
+        ItemType.objects.create(id=28, name="Compressed Tritanium")
+        ItemType.objects.create(id=35, name="Pyerite")
+        ItemType.objects.create(id=36, name="Mexallon")
+        SolarSystem.objects.create(id=30000142, name="Jita", name_zh_hans="吉他")
+        SolarSystem.objects.create(id=30000144, name="Perimeter")
+        Region.objects.create(id=10000002, name="The Forge", name_de="Schmiede")
+
+    def setUp(self):
+        reset_build_number()
+        search.clear_cache()
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = patch.object(app_settings, "ESDE_DATA_DIR", self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+
+    def ids(self, *args, **kwargs):
+        return [r.id for r in search.search(*args, **kwargs)]
+
+    def test_prefix(self):
+        self.assertEqual(self.ids("tri", fuzzy=False), [34])
+        self.assertEqual(self.ids("  JI"), [30000142])
+        self.assertEqual(self.ids("p", fuzzy=False), [35, 30000144])
+        self.assertEqual(search.search("the f")[0], search.SearchResult(10000002, "region", "The Forge", 1.0))
+        self.assertEqual(search.search(""), [])
+
+    def test_fuzzy(self):
+        self.assertEqual(self.ids("tritanium")[:2], [34, 28])
+        self.assertEqual(self.ids("tritanum")[0], 34)
+        self.assertEqual(self.ids("mexalon"), [36])
+        self.assertLess(search.search("tritanium")[1].score, 1)
+
+    def test_categories_and_limit(self):
+        self.assertEqual(self.ids("p", categories=["solar_system"]), [30000144])
+        self.assertEqual(len(search.search("tritanium", limit=1)), 1)
+        with self.assertRaises(ValueError):
+            search.search("p", categories=["moon"])
+
+    def test_languages(self):
+        self.assertEqual(search.search("트리", "ko")[0].name, "트리타늄")
+        self.assertEqual(self.ids("吉", "zh-hans"), [30000142])
+        # untranslated names are searched in English
+        self.assertEqual(self.ids("mex", "ko"), [36])
+
+    def test_fallback_is_english_in_any_request_language(self):
+        with translation.override("de"):
+            self.assertEqual(search.search("mex", "ko")[0].name, "Mexallon")
+            self.assertEqual(self.ids("the forge", "ko", fuzzy=False), [10000002])
+
+    def test_build_and_load(self):
+        search.build_search_indexes()
+        current_build_number()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.ids("tritanium")[:2], [34, 28])
+        self.assertTrue(hasattr(search.get_search_index().postings, "filename"))
+
+    def test_saved_index_replaces_the_fallback(self):
+        # asked before the post import step, built in memory
+        self.assertEqual(self.ids("tritanium")[:2], [34, 28])
+        self.assertFalse(hasattr(search.get_search_index().postings, "filename"))
+        search.build_search_indexes()
+        self.assertTrue(hasattr(search.get_search_index().postings, "filename"))
+        self.assertEqual(self.ids("tritanium")[:2], [34, 28])
@@ -0,0 +1,109 @@
+"""
+Shared read only SDE snapshot
+"""
+# Standard Library
+import io
+import tempfile
+from unittest.mock import patch
+
+# Django
+from django.test import TestCase
+from django.utils import translation
+
+# AA Example App
+from eve_sde import app_settings, snapshot
+from eve_sde.build import current_build_number, reset_build_number
+from eve_sde.models import (
+    Constellation,
+    EveSDE,
+    ItemCategory,
+    ItemGroup,
+    ItemType,
+    Region,
+    SolarSystem,
+)
+
+
+class TestSnapshot(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        EveSDE.objects.update_or_create(pk=1, defaults={"build_number": 1})
+        ItemCategory.objects.create(id=4, name="Material", published=True)
+        ItemGroup.objects.create(id=18, name="Mineral", category_id=4, published=True)
+        ItemType.objects.create(id=34, name="Tritanium", name_de="Tritanium DE", group_id=18, volume=0.01, published=True)
+        ItemType.objects.create(id=35, name="Pyerite")
+        Region.objects.create(id=10000002, name="The Forge")
+        Constellation.objects.create(id=20000020, name="Kimotoro", region_id=10000002)
+        SolarSystem.objects.create(
+            id=30000142, name="Jita", name_zh_hans="吉他", constellation_id=20000020,
+            region_id=10000002, security_status=0.9459, x=1.0, y=2.0, z=3.0
+        )
+
+    def setUp(self):
+        reset_build_number()
+        snapshot.clear_cache()
+        self.data_dir = tempfile.TemporaryDirectory()
+        patcher = patch.object(app_settings, "ESDE_DATA_DIR", self.data_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.data_dir.cleanup)
+
+    def test_lookups(self):
+        snap = snapshot.get_snapshot()
+        self.assertEqual(
+            snap.types.get(34),
+            {"id": 34, "name": "Tritanium", "group_id": 18, "category_id": 4, "volume": 0.01, "published": True}
+        )
+        self.assertEqual(snap.types.get(35)["group_id"], None)
+        self.assertEqual(snap.types.get(35)["volume"], None)
+        self.assertIsNone(snap.types.get(99))
+        self.assertEqual(snap.types.value(34, "category_id"), 4)
+        self.assertEqual(snap.systems.value(30000142, "region_id"), 10000002)
+        self.assertEqual(snap.constellations.value(20000020, "region_id"), 10000002)
+        self.assertEqual(snap.regions.name(10000002), "The Forge")
+        self.assertEqual(snap.types.rows([35, 99, 34]).tolist(), [1, -1, 0])
+        with self.assertRaises(KeyError):
+            snap.types.value(34, "mass")
+
+    def test_languages(self):
+        snap = snapshot.get_snapshot()
+        self.assertEqual(snap.types.name(34, "de"), "Tritanium DE")
+        self.assertEqual(snap.systems.name(30000142, "zh-hans"), "吉他")
+        # untranslated names are English
+        self.assertEqual(snap.types.name(35, "de"), "Pyerite")
+        with patch.object(app_settings, "ESDE_LANGUAGES", ["de"]):
+            snap = snapshot.read_snapshot(self.write())
+        self.assertEqual(snap.types.name(34, "de"), "Tritanium DE")
+        self.assertEqual(snap.systems.name(30000142, "zh-hans"), "Jita")
+
+    def test_untranslated_names_are_english(self):
+        with translation.override("de"):
+            snap = snapshot.read_snapshot(self.write())
+        self.assertEqual(snap.types.name(35, "ko"), "Pyerite")
+        self.assertEqual(snap.types.name(34, "ko"), "Tritanium")
+        self.assertEqual(snap.types.name(34, "de"), "Tritanium DE")
+
+    def write(self):
+        f = io.BytesIO()
+        snapshot.write_snapshot(f, 1, snapshot.compute_snapshot())
+        return f.getvalue()
+
+    def test_build_and_load(self):
+        # built in memory until the snapshot is saved
+        fallback = snapshot.get_snapshot()
+        self.assertEqual(fallback.types.name(34), "Tritanium")
+        with self.assertNumQueries(0):
+            self.assertIs(snapshot.get_snapshot(), fallback)
+        snapshot.build_sde_snapshot()
+        current_build_number()
+        with self.assertNumQueries(0):
+            snap = snapshot.get_snapshot()
+            self.assertEqual(snap.types.name(34), "Tritanium")
+            self.assertEqual(snap.systems.value(30000142, "security_status"), 0.9459)
+        self.assertIsNot(snap, fallback)
+        self.assertIs(snapshot.get_snapshot(), snap)
+        self.assertEqual(snap.build, 1)
+        self.assertIsNone(snapshot.load_snapshot(2))
+        with self.assertRaises(ValueError):
+            snapshot.read_snapshot(b"\0" * 64)
@@ -0,0 +1,57 @@
+"""
+Test helpers
+"""
+# Standard Library
+import json
+import os
+
+SDE_BUILD = {"_key": "sde", "buildNumber": 1, "releaseDate": "2025-12-15T11:14:02Z"}
+
+
+def write_sde(folder, files):
+    """
+    Write a minimal SDE export, `files` is {filename: [rows]}
+    """
+    with open(os.path.join(folder, "_sde.jsonl"), "w") as f:
+        f.write(json.dumps(SDE_BUILD))
+    for filename, rows in files.items():
+        with open(os.path.join(folder, filename), "w") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+
+def pos(x=0, y=0, z=0):
+    return {"x": x, "y": y, "z": z}
+
+
+MAP_SDE = {
+    "types.jsonl": [
+        {"_key": 11, "name": {"en": "Planet (Temperate)"}, "published": False},
+        {"_key": 14, "name": {"en": "Moon", "de": "Mond"}, "published": False},
+    ],
+    "mapRegions.jsonl": [
+        {"_key": 10000001, "name": {"en": "Derelik", "de": "Derelik DE"}, "position": pos()},
+    ],
+    "mapConstellations.jsonl": [
+        {"_key": 20000001, "name": {"en": "San Matar"}, "regionID": 10000001, "position": pos()},
+    ],
+    "mapSolarSystems.jsonl": [
+        {
+            "_key": 30000001, "name": {"en": "Tanoo", "de": "Tanoo DE"}, "constellationID": 20000001,
+            "regionID": 10000001, "securityStatus": 0.85, "securityClass": "B", "position": pos(),
+        },
+    ],
+    "mapPlanets.jsonl": [
+        {"_key": 40000002, "celestialIndex": 1, "solarSystemID": 30000001, "typeID": 11, "position": pos()},
+    ],
+    "mapMoons.jsonl": [
+        {
+            "_key": 40000003, "celestialIndex": 1, "orbitID": 40000002, "orbitIndex": 1,
+            "solarSystemID": 30000001, "typeID": 14, "position": pos(),
+        },
+        {
+            "_key": 40000004, "celestialIndex": 1, "orbitID": 40000002, "orbitIndex": 2,
+            "solarSystemID": 30000001, "typeID": 14, "position": pos(),
+        },
+    ],
+}
@@ -9,4 +9,5 @@ app_name: str = "esde"  # pylint: disable=invalid-name
 
 urlpatterns = [
     path("", views.index, name="index"),
+    path("universe.bin", views.universe_bundle, name="universe_bundle"),
 ]
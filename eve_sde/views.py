@@ -3,9 +3,13 @@ import os
 
 # Django
 from django.contrib.auth.decorators import login_required, permission_required
+from django.http import FileResponse, HttpResponse
 from django.shortcuts import render
+from django.views.decorators.http import etag
 
+from .build import current_build_number
 from .models import EveSDE, EveSDESection
+from .navigation.bundle import bundle_path
 
 
 @login_required
@@ -16,3 +20,31 @@ def index(request):
 
     # render to template
     return render(request, 'esde/index.html', context={"sections": sections, "global": EveSDE.get_solo()})
+
+
+# Seconds a client waits before asking again while the bundle is built
+BUNDLE_RETRY_SECONDS = 60
+
+
+def _bundle_etag(request):
+    # no ETag (or 304) until the bundle of the loaded build has been saved
+    build = current_build_number()
+    return f"esde-{build}" if os.path.exists(bundle_path(build)) else None
+
+
+@etag(_bundle_etag)
+def universe_bundle(request):
+    """
+    The binary universe bundle of the loaded build, public like the SDE.
+    503 while it is being built after an import.
+    """
+    path = bundle_path(current_build_number())
+    if not os.path.exists(path):
+        response = HttpResponse("Universe bundle is being built", status=503, content_type="text/plain")
+        response["Retry-After"] = str(BUNDLE_RETRY_SECONDS)
+        return response
+    return FileResponse(
+        open(path, "rb"),
+        content_type="application/octet-stream",
+        filename=os.path.basename(path)
+    )
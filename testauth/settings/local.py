@@ -60,6 +60,9 @@ NOTIFICATIONS_MAX_PER_USER = 50
 #         },
 #     }
 
+# modeltranslation needs to be loaded before the apps it translates
+INSTALLED_APPS = ["modeltranslation"] + INSTALLED_APPS
+
 # Add any additional apps to this list.
 INSTALLED_APPS += [
     PACKAGE,